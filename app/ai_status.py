@@ -1,22 +1,66 @@
 """AI service status checking."""
 
-from deps import Dict, Optional, OpenAI, time
+from deps import Any, Dict, Optional, OpenAI, Tuple, dataclass, threading, time
 from .config import get_together_api_key, get_together_model
 
-# Cache status for 30 seconds to avoid excessive API calls
-_status_cache: Optional[Dict[str, any]] = None
-_cache_timestamp: float = 0
+TOGETHER_BASE_URL = "https://api.together.xyz/v1"
+
+# Live probe results are re-checked every 30 seconds to avoid excessive API calls
 CACHE_TTL = 30.0  # seconds
+# Configuration problems (no package, missing/placeholder key) only change with config
+CONFIG_FAILURE_TTL = 24 * 60 * 60.0  # seconds
 
 
-def get_ai_status() -> Dict[str, any]:
-    """Check AI service availability and return status info."""
-    global _status_cache, _cache_timestamp
-    
-    # Return cached status if still valid
-    if _status_cache and (time.time() - _cache_timestamp) < CACHE_TTL:
-        return _status_cache
-    
+@dataclass(frozen=True)
+class _CacheState:
+    status: Optional[Dict[str, any]] = None
+    timestamp: float = 0.0
+    ttl: float = 0.0
+    key_hash: Optional[int] = None
+    probed: bool = False
+
+    def is_fresh(self, now: float, key_hash: int) -> bool:
+        return (
+            self.status is not None
+            and self.key_hash == key_hash
+            and (now - self.timestamp) < self.ttl
+        )
+
+
+# Replaced wholesale under _lock, so readers always see a consistent snapshot
+_cache = _CacheState()
+_lock = threading.Lock()
+# Held while a background refresh is running so at most one is in flight
+_refresh_lock = threading.Lock()
+
+
+# Together.ai clients by (key, base_url): status probes and AIService share one connection pool
+_clients: Dict[Tuple[str, str], Any] = {}
+# Held while a client is built and inserted, so concurrent first uses never build (and leak) a second pool
+_clients_lock = threading.Lock()
+
+
+def pooled_client(key: str, base_url: str = TOGETHER_BASE_URL):
+    """Shared OpenAI client for key and base_url, built on first use and closed by close_clients()."""
+    client = _clients.get((key, base_url))
+    if client is None:
+        with _clients_lock:
+            client = _clients.get((key, base_url))
+            if client is None:
+                client = _clients[(key, base_url)] = OpenAI(api_key=key, base_url=base_url)
+    return client
+
+
+def close_clients() -> None:
+    """Close pooled Together.ai connections (called on app shutdown)."""
+    with _clients_lock:
+        while _clients:
+            _, client = _clients.popitem()
+            client.close()
+
+
+def _check_status(key: str) -> _CacheState:
+    """Run the availability checks for `key` and wrap the result with its TTL."""
     status = {
         "available": False,
         "reason": "",
@@ -24,53 +68,90 @@ def get_ai_status() -> Dict[str, any]:
         "openai_available": False,
         "model": get_together_model(),
     }
-    
+
+    def config_failure(reason: str) -> _CacheState:
+        status["reason"] = reason
+        return _CacheState(status, time.monotonic(), CONFIG_FAILURE_TTL, hash(key))
+
     # Check if openai module is available
     if OpenAI is None:
-        status["reason"] = "openai package not installed"
-        return status
+        return config_failure("openai package not installed")
     status["openai_available"] = True
-    
+
     # Check if API key is set
-    key = get_together_api_key()
     if not key:
-        status["reason"] = "TOGETHER_API_KEY not set in .env"
-        return status
-    
+        return config_failure("TOGETHER_API_KEY not set in .env")
+
     status["api_key_set"] = True
-    
+
     # Check if key looks valid (basic validation)
     if len(key) < 10:
-        status["reason"] = "TOGETHER_API_KEY appears invalid (too short)"
-        return status
-    
+        return config_failure("TOGETHER_API_KEY appears invalid (too short)")
+
     if key.startswith("your_api_key") or key == "your_api_key_here":
-        status["reason"] = "TOGETHER_API_KEY not configured (still using placeholder)"
-        return status
-    
-    # Actually test the API key with a minimal request
+        return config_failure("TOGETHER_API_KEY not configured (still using placeholder)")
+
+    # Verify the key with an authenticated GET /models: no inference, no model wakeup
     try:
-        client = OpenAI(api_key=key, base_url="https://api.together.xyz/v1")
-        # Make a minimal test request
-        test_response = client.chat.completions.create(
-            model=status["model"],
-            messages=[{"role": "user", "content": "test"}],
-            max_tokens=1,
-            timeout=5.0,
-        )
+        client = pooled_client(key)
+        client.models.list(timeout=5.0)
         status["available"] = True
         status["reason"] = "AI features available"
     except Exception as e:
         error_msg = str(e)
-        if "401" in error_msg or "Unauthorized" in error_msg or "Invalid" in error_msg:
+        if any(marker in error_msg for marker in ("401", "403", "Unauthorized", "Invalid")):
             status["reason"] = "TOGETHER_API_KEY is invalid or expired"
         elif "timeout" in error_msg.lower():
             status["reason"] = "API request timed out (check network)"
         else:
             status["reason"] = f"API test failed: {error_msg[:100]}"
-    
-    # Cache the result
-    _status_cache = status
-    _cache_timestamp = time.time()
-    
-    return status
+
+    return _CacheState(status, time.monotonic(), CACHE_TTL, hash(key), probed=True)
+
+
+def _refresh_in_background(key: str) -> None:
+    """Re-probe on a daemon thread unless a refresh is already running."""
+    if not _refresh_lock.acquire(blocking=False):
+        return
+
+    def run() -> None:
+        global _cache
+        try:
+            state = _check_status(key)
+            with _lock:
+                _cache = state
+        finally:
+            _refresh_lock.release()
+
+    threading.Thread(target=run, name="ai-status-refresh", daemon=True).start()
+
+
+def get_ai_status() -> Dict[str, any]:
+    """Check AI service availability and return status info."""
+    global _cache
+
+    key = get_together_api_key()
+    key_hash = hash(key)
+
+    # Fast path: no lock while the cached status is fresh
+    state = _cache
+    if state.is_fresh(time.monotonic(), key_hash):
+        return state.status
+
+    # An expired probe for the same key is served stale while it is re-probed
+    if state.probed and state.key_hash == key_hash:
+        _refresh_in_background(key)
+        return state.status
+
+    with _lock:
+        # Another thread may have refreshed the cache while we waited
+        state = _cache
+        if not state.is_fresh(time.monotonic(), key_hash):
+            state = _cache = _check_status(key)
+
+    return state.status
+
+
+def warm_up() -> None:
+    """Start the first status probe in the background so no request waits on it."""
+    threading.Thread(target=get_ai_status, name="ai-status-warmup", daemon=True).start()
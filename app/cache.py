@@ -0,0 +1,59 @@
+"""Small in-process caches shared by the routes."""
+
+from deps import Any, contextmanager, Dict, Hashable, Iterator, Optional, OrderedDict, threading, time
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a fixed capacity; entries expire ttl seconds after they are set."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, value), least recently used first
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live value for key (marking it most recently used), or default."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                # Expired entries are dropped lazily, on access
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert or replace key, evicting least recently used entries beyond maxsize."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class KeyedLocks:
+    """One lock per key, so concurrent cache misses for the same key compute it only once."""
+
+    def __init__(self) -> None:
+        # key -> [lock, holders + waiters]; entries are dropped when no thread uses them
+        self._locks: Dict[Hashable, list] = {}
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        """Hold the lock for key for the duration of the with block."""
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
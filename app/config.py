@@ -8,25 +8,68 @@ _project_root = _app_dir.parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-from deps import load_dotenv, os, Path
+from deps import functools, load_dotenv, os
 
 load_dotenv()
 
 
+@functools.lru_cache(maxsize=1)
 def get_together_api_key() -> str:
     """Together.ai API key (required for AI features)."""
     return os.environ.get("TOGETHER_API_KEY", "").strip()
 
 
+@functools.lru_cache(maxsize=1)
 def get_together_model() -> str:
     """Together.ai model. Default: deepseek-ai/DeepSeek-V3.1."""
     return os.environ.get("TOGETHER_MODEL", "deepseek-ai/DeepSeek-V3.1").strip()
 
 
+@functools.lru_cache(maxsize=1)
+def get_worker_threads() -> int:
+    """Threads for sync route handlers (each blocks for the length of its AI calls). Default: 100."""
+    try:
+        return max(1, int(os.environ.get("WORKER_THREADS", "100")))
+    except ValueError:
+        return 100
+
+
+@functools.lru_cache(maxsize=1)
+def get_ai_max_concurrency() -> int:
+    """Together.ai requests allowed in flight at once (read once, when the AI service is imported). Default: 8."""
+    try:
+        return max(1, int(os.environ.get("AI_MAX_CONCURRENCY", "8")))
+    except ValueError:
+        return 8
+
+
+@functools.lru_cache(maxsize=1)
+def get_checker_processes() -> int:
+    """Worker processes for rule checks on large file sets (1 = check in the request thread). Default: CPU count."""
+    default = os.cpu_count() or 1
+    try:
+        return max(1, int(os.environ.get("CHECKER_PROCESSES", str(default))))
+    except ValueError:
+        return default
+
+
+def invalidate() -> None:
+    """Drop cached settings so the next access re-reads os.environ (e.g. in tests)."""
+    get_together_api_key.cache_clear()
+    get_together_model.cache_clear()
+    get_worker_threads.cache_clear()
+    get_ai_max_concurrency.cache_clear()
+    get_checker_processes.cache_clear()
+    get_host.cache_clear()
+    get_port.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
 def get_host() -> str:
     return os.environ.get("HOST", "0.0.0.0").strip()
 
 
+@functools.lru_cache(maxsize=1)
 def get_port() -> int:
     try:
         return int(os.environ.get("PORT", "8000"))
@@ -34,13 +77,11 @@ def get_port() -> int:
         return 8000
 
 
+@functools.cache
 def ensure_checker_import_path() -> None:
     """Add project root to sys.path so cross_platform_checker is importable."""
-    import sys
-
-    app_dir = Path(__file__).resolve().parent
-    # app -> compatibility-checker-api (project root, contains cross_platform_checker)
-    project_root = app_dir.parent
-    s = str(project_root)
+    # app -> compatibility-checker-api (project root, contains cross_platform_checker);
+    # resolved once at import above
+    s = str(_project_root)
     if s not in sys.path:
         sys.path.insert(0, s)
@@ -1,33 +1,40 @@
 """FastAPI app: main entry point."""
 
-from urllib.parse import urlparse
-
-from .config import ensure_checker_import_path
-from deps import CORSMiddleware, FastAPI, HTTPException
+from .config import ensure_checker_import_path, get_worker_threads
+from .ai_status import close_clients, warm_up
+from deps import FastAPI, HTTPException, anyio, asynccontextmanager
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from starlette.requests import Request
+from .middleware import OpenCORSMiddleware
+from .services.checker import shutdown_pool
 from .routes import (
     review_router,
     root_router,
 )
-from .startup import validate_config
 from .templates import render_homepage
 
 ensure_checker_import_path()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App lifetime: size the worker threadpool and warm the AI status cache on startup, release pooled connections and checker processes on shutdown."""
+    # Sync handlers run in anyio's default threadpool (40 threads), which caps concurrent analyses
+    anyio.to_thread.current_default_thread_limiter().total_tokens = get_worker_threads()
+    warm_up()
+    yield
+    close_clients()
+    shutdown_pool()
+
+
 app = FastAPI(
     title="AI-Powered Cross-Platform Compatibility Checker API",
     description="Rule-based checks plus Together.ai fix suggestions and test generation.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(OpenCORSMiddleware)
 
 # Register routes
 app.include_router(root_router)
@@ -40,9 +47,9 @@ def _redirect_url_for_unknown_path(request: Request) -> str:
     base = str(request.base_url).rstrip("/")
     if not referer or not referer.startswith(base):
         return "/"
-    parsed = urlparse(referer)
-    path = (parsed.path or "/").rstrip("/") or "/"
-    fragment = parsed.fragment or ""
+    # Referer is known to start with scheme://host, so slice the rest instead of urlparse
+    rest, _, fragment = referer[len(base):].partition("#")
+    path = rest.partition("?")[0].rstrip("/") or "/"
     if "review" in path or "results" in path.lower() or fragment == "review":
         return "/#review"
     return "/"
@@ -66,9 +73,3 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         html = render_homepage(review_tab_open=True, form_error="Too many files. Maximum number of files is 1000.")
         return HTMLResponse(html)
     return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
-
-
-@app.on_event("startup")
-def startup_event() -> None:
-    """Run startup validation."""
-    validate_config()
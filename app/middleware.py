@@ -0,0 +1,55 @@
+"""ASGI middleware."""
+
+from deps import Any, Dict
+
+# Response headers for the fully open API (any origin, method, and header). Credentials are allowed, so the
+# request's Origin is echoed in access-control-allow-origin rather than "*" (the spec forbids "*" with credentials)
+_CORS_HEADERS = (
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+)
+_PREFLIGHT_HEADERS = (
+    (b"access-control-allow-credentials", b"true"),
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"vary", b"Origin, Access-Control-Request-Method, Access-Control-Request-Headers"),
+)
+
+
+class OpenCORSMiddleware:
+    """Append allow-all CORS headers to cross-origin requests and answer preflights without reaching the app."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        origin = request_headers.get(b"origin")
+        if origin is None:
+            # Not a cross-origin request: no CORS headers
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in request_headers:
+            headers = [(b"access-control-allow-origin", origin), *_PREFLIGHT_HEADERS]
+            requested = request_headers.get(b"access-control-request-headers")
+            if requested:
+                headers.append((b"access-control-allow-headers", requested))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"access-control-allow-origin", origin),
+                    *_CORS_HEADERS,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
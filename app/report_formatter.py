@@ -1,9 +1,12 @@
 """Format analysis results as human-readable Markdown (aligned with webpage layout)."""
 
-from deps import Any, Dict, List, Optional, Path, datetime
+from deps import Any, Dict, functools, io, Iterator, List, Optional, os, Tuple, datetime
 from .schemas import FileIssues, IssueOut
 
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+
+@functools.lru_cache(maxsize=128)
 def _title_case(s: str) -> str:
     """e.g. ERROR -> Error, DEPRECATION -> Deprecation."""
     if not s:
@@ -11,162 +14,168 @@ def _title_case(s: str) -> str:
     return s.replace("_", " ").strip().lower().title()
 
 
-def _issue_block_md(i: IssueOut) -> List[str]:
+def _bucket(issues: List[IssueOut]) -> Tuple[List[IssueOut], List[IssueOut], List[IssueOut]]:
+    """Split issues into (errors, warnings, infos) in one pass, preserving order."""
+    errors: List[IssueOut] = []
+    warnings: List[IssueOut] = []
+    infos: List[IssueOut] = []
+    for i in issues:
+        sev = i.severity
+        if sev == "ERROR":
+            errors.append(i)
+        elif sev == "WARNING":
+            warnings.append(i)
+        elif sev == "INFO":
+            infos.append(i)
+    return errors, warnings, infos
+
+
+@functools.lru_cache(maxsize=256)
+def _badge_str(ec: int, wc: int, ic: int) -> str:
+    """Per-file severity badges, e.g. "Errors: 2 · Info: 1" (few distinct count triples repeat across files)."""
+    parts = (
+        f"Errors: {ec}" if ec else "",
+        f"Warnings: {wc}" if wc else "",
+        f"Info: {ic}" if ic else "",
+    )
+    return " · ".join([p for p in parts if p]) or "No issues"
+
+
+def _issue_block_md(i: IssueOut) -> str:
     """One issue as Markdown: Line N · Category · Severity, then message, code, fix (like webpage)."""
     cat = _title_case(getattr(i, "category", "") or "")
     sev = _title_case(getattr(i, "severity", "") or "")
-    lines = []
-    lines.append(f"**Line {i.line_number} · {cat} · {sev}**")
-    lines.append("")
-    lines.append(i.message)
-    lines.append("")
-    lines.append("- **Code:**")
-    lines.append("```")
-    lines.append(i.code)
-    lines.append("```")
-    lines.append("")
-    lines.append("- **Fix:**")
-    lines.append("```")
-    lines.append(i.suggestion)
-    lines.append("```")
-    lines.append("")
-    return lines
+    return (
+        f"**Line {i.line_number} · {cat} · {sev}**\n\n"
+        f"{i.message}\n\n"
+        f"- **Code:**\n```\n{i.code}\n```\n\n"
+        f"- **Fix:**\n```\n{i.suggestion}\n```\n"
+    )
 
 
-def format_text_report(
+def _file_section_md(file_issues: FileIssues, ec: int, wc: int, ic: int) -> str:
+    """One file's block in the multi-file report: heading with badges, then its issues."""
+    file_name = os.path.basename(file_issues.file_path)
+    language = file_issues.language or "unknown"
+    heading = f"\n### {file_name} ({language}) — {_badge_str(ec, wc, ic)}\n"
+    if not file_issues.issues:
+        return heading + "\nNo issues found.\n"
+    return heading + "".join(["\n" + _issue_block_md(i) for i in file_issues.issues])
+
+
+def iter_text_report(
     file_path: str,
     issues: List[IssueOut],
     ai_suggestions: Optional[str],
     generated_tests: Optional[str],
-) -> str:
-    """Format single-file analysis results as Markdown (structure mirrors results page)."""
-    lines = []
-    lines.append(f"# Results: {file_path}")
-    lines.append("")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("")
-
-    error_count = sum(1 for i in issues if i.severity == "ERROR")
-    warning_count = sum(1 for i in issues if i.severity == "WARNING")
-    info_count = sum(1 for i in issues if i.severity == "INFO")
-    lines.append(f"**{len(issues)}** issue(s) found ({error_count} error(s), {warning_count} warning(s), {info_count} info).")
-    lines.append("")
+) -> Iterator[str]:
+    """Yield the single-file Markdown report section by section (joined, equals format_text_report)."""
+    # Clean files are the common case: skip bucketing when there is nothing to sort
+    errors, warnings, infos = _bucket(issues) if issues else ((), (), ())
+    yield (
+        f"# Results: {file_path}\n\n"
+        f"Generated: {datetime.now().strftime(_TIMESTAMP_FORMAT)}\n\n"
+        f"**{len(issues)}** issue(s) found ({len(errors)} error(s), {len(warnings)} warning(s), {len(infos)} info).\n"
+    )
 
     # Issues section (like the collapsible "Issues" on the page)
-    lines.append("## Issues")
-    lines.append("")
+    yield "\n## Issues\n"
     if not issues:
-        lines.append("No compatibility issues found.")
-        lines.append("")
+        yield "\nNo compatibility issues found.\n"
     else:
-        errors = [i for i in issues if i.severity == "ERROR"]
-        warnings = [i for i in issues if i.severity == "WARNING"]
-        infos = [i for i in issues if i.severity == "INFO"]
-        for i in errors + warnings + infos:
-            lines.extend(_issue_block_md(i))
+        for group in (errors, warnings, infos):
+            for i in group:
+                yield "\n" + _issue_block_md(i)
 
     if ai_suggestions:
-        lines.append("## AI fix suggestions")
-        lines.append("")
-        lines.append(ai_suggestions.strip())
-        lines.append("")
+        yield f"\n## AI fix suggestions\n\n{ai_suggestions.strip()}\n"
 
     if generated_tests:
-        lines.append("## Generated tests")
-        lines.append("")
-        lines.append(generated_tests.strip())
-        lines.append("")
+        yield f"\n## Generated tests\n\n{generated_tests.strip()}\n"
 
-    return "\n".join(lines)
 
+def format_text_report(
+    file_path: str,
+    issues: List[IssueOut],
+    ai_suggestions: Optional[str],
+    generated_tests: Optional[str],
+) -> str:
+    """Format single-file analysis results as Markdown (structure mirrors results page)."""
+    return "".join(iter_text_report(file_path, issues, ai_suggestions, generated_tests))
 
-def format_multi_file_report(
+
+def iter_multi_file_report(
     source_path: str,
     source_type: str,
     files: List[FileIssues],
     cross_file_insights: Optional[str],
     dependency_graph: Dict[str, Any],
     ai_fix_suggestions: Optional[str],
-) -> str:
-    """Format multi-file analysis results as Markdown (structure mirrors multi-file results page)."""
-    lines = []
-    lines.append(f"# Multi-File Analysis Results: {source_path}")
-    lines.append("")
-    lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append("")
-
-    all_issues: List[IssueOut] = []
+) -> Iterator[str]:
+    """Yield the multi-file Markdown report section by section (joined, equals format_multi_file_report)."""
+    # Per-file severity counts, reused for the totals and each file's badges
+    counts = []
     for f in files:
-        all_issues.extend(f.issues)
-    total_issues = len(all_issues)
-    error_count = sum(1 for i in all_issues if i.severity == "ERROR")
-    warning_count = sum(1 for i in all_issues if i.severity == "WARNING")
-    info_count = sum(1 for i in all_issues if i.severity == "INFO")
-    lines.append(f"**{len(files)}** file(s) analyzed · **{total_issues}** total issue(s) found ({error_count} error(s), {warning_count} warning(s), {info_count} info)")
-    lines.append("")
+        errors, warnings, infos = _bucket(f.issues)
+        counts.append((len(errors), len(warnings), len(infos)))
+    total_issues = sum(len(f.issues) for f in files)
+    error_count = sum(c[0] for c in counts)
+    warning_count = sum(c[1] for c in counts)
+    info_count = sum(c[2] for c in counts)
+    # Each section after the header starts with its "\n" separator
+    yield (
+        f"# Multi-File Analysis Results: {source_path}\n\n"
+        f"Generated: {datetime.now().strftime(_TIMESTAMP_FORMAT)}\n\n"
+        f"**{len(files)}** file(s) analyzed · **{total_issues}** total issue(s) found ({error_count} error(s), {warning_count} warning(s), {info_count} info)\n"
+    )
 
     # Dependency Relationships (like the collapsible on the page)
     if dependency_graph:
-        lines.append("## Dependency Relationships")
-        lines.append("")
+        basename = os.path.basename
+        buf = io.StringIO()
+        w = buf.write
+        w("\n## Dependency Relationships\n")
         for file_path, data in list(dependency_graph.items())[:50]:
-            file_name = Path(file_path).name
+            file_name = basename(file_path)
             imports = data.get("imports", [])
             imported_by = data.get("imported_by", [])
             lang = data.get("language", "unknown")
-            lines.append(f"- **{file_name}** ({lang})")
+            w(f"\n- **{file_name}** ({lang})\n")
             if imports:
-                import_names = [Path(imp).name for imp in imports[:10]]
-                lines.append(f"  - Imports: {', '.join(import_names)}")
+                import_names = [basename(imp) for imp in imports[:10]]
+                w(f"  - Imports: {', '.join(import_names)}\n")
             if imported_by:
-                importer_names = [Path(imp).name for imp in imported_by[:10]]
-                lines.append(f"  - Imported by: {', '.join(importer_names)}")
+                importer_names = [basename(imp) for imp in imported_by[:10]]
+                w(f"  - Imported by: {', '.join(importer_names)}\n")
             if not imports and not imported_by:
-                lines.append("  - *(no dependencies)*")
-            lines.append("")
-        lines.append("")
+                w("  - *(no dependencies)*\n")
+        w("\n")
+        yield buf.getvalue()
 
     # Standard File Issues (like the collapsible with per-file details)
-    lines.append("## Standard File Issues")
-    lines.append("")
-    for file_issues in files:
-        file_name = Path(file_issues.file_path).name
-        issues = file_issues.issues
-        language = file_issues.language or "unknown"
-        ec = sum(1 for i in issues if i.severity == "ERROR")
-        wc = sum(1 for i in issues if i.severity == "WARNING")
-        ic = sum(1 for i in issues if i.severity == "INFO")
-        badges = []
-        if ec:
-            badges.append(f"Errors: {ec}")
-        if wc:
-            badges.append(f"Warnings: {wc}")
-        if ic:
-            badges.append(f"Info: {ic}")
-        badge_str = " · ".join(badges) if badges else "No issues"
-        lines.append(f"### {file_name} ({language}) — {badge_str}")
-        lines.append("")
-        if not issues:
-            lines.append("No issues found.")
-            lines.append("")
-            continue
-        for i in issues:
-            lines.extend(_issue_block_md(i))
-    lines.append("")
+    yield "\n## Standard File Issues\n"
+    for fi, c in zip(files, counts):
+        yield _file_section_md(fi, *c)
+    yield "\n"
 
     # AI-generated insights (same order as page: Cross-File then Group-Level Fix Suggestions)
     if cross_file_insights or ai_fix_suggestions:
-        lines.append("## AI-generated insights")
-        lines.append("")
+        yield "\n## AI-generated insights\n"
         if cross_file_insights:
-            lines.append("### Cross-File Compatibility Insights")
-            lines.append("")
-            lines.append(cross_file_insights.strip())
-            lines.append("")
+            yield f"\n### Cross-File Compatibility Insights\n\n{cross_file_insights.strip()}\n"
         if ai_fix_suggestions:
-            lines.append("### Group-Level AI Fix Suggestions")
-            lines.append("")
-            lines.append(ai_fix_suggestions.strip())
-            lines.append("")
+            yield f"\n### Group-Level AI Fix Suggestions\n\n{ai_fix_suggestions.strip()}\n"
 
-    return "\n".join(lines)
+
+def format_multi_file_report(
+    source_path: str,
+    source_type: str,
+    files: List[FileIssues],
+    cross_file_insights: Optional[str],
+    dependency_graph: Dict[str, Any],
+    ai_fix_suggestions: Optional[str],
+) -> str:
+    """Format multi-file analysis results as Markdown (structure mirrors multi-file results page)."""
+    return "".join(iter_multi_file_report(
+        source_path, source_type, files, cross_file_insights, dependency_graph, ai_fix_suggestions
+    ))
@@ -3,25 +3,35 @@
 import re
 from deps import (
     APIRouter,
+    BinaryIO,
     Dict,
     File,
     Form,
+    hashlib,
     HTMLResponse,
     HTTPException,
+    Iterator,
+    json,
     List,
+    nullcontext,
     Optional,
+    os,
     Path,
     Query,
     Response,
+    secrets,
+    stat,
+    StreamingResponse,
+    tempfile,
+    ThreadPoolExecutor,
+    time,
     Tuple,
     UploadFile,
-    time,
-    uuid,
 )
 from fastapi.responses import RedirectResponse
-from ..report_formatter import format_multi_file_report, format_text_report
+from ..cache import KeyedLocks, TTLCache
+from ..report_formatter import iter_multi_file_report, iter_text_report
 from ..schemas import (
-    AnalyzeRequest,
     FileIssues,
     IssueOut,
     MultiFileAnalyzeRequest,
@@ -29,27 +39,47 @@ from ..schemas import (
 )
 from ..config import ensure_checker_import_path
 from ..services import AIService, CheckerService
+from ..services.ai import GROUP_CODE_SAMPLE_FILES
 from ..services.file_extractor import (
     build_temp_tree_from_uploads,
     cleanup_temp_files,
+    extract_archive,
     extract_files,
 )
 from ..services.relationship_detector import build_dependency_graph, format_relationship_summary
 
 ensure_checker_import_path()
 from cross_platform_checker.utils import detect_language
-from ..templates import render_review_form, render_review_results
-from ..utils import run_check
+from ..templates import render_review_form, render_review_multi_results, render_review_results
+from ..utils import check_path, read_capped
 
 router = APIRouter()
 ai_svc = AIService()
 checker_svc = CheckerService()
+# Background workers for Together.ai calls that can overlap within one request
+_ai_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="review-ai")
 
-# Cache analysis results: key = file_path, value = (issues, code, lang, ai_suggestions, generated_tests, timestamp)
-_results_cache: Dict[str, Tuple[list, Optional[str], Optional[str], Optional[str], Optional[str], float]] = {}
-# Cache multi-file report for upload flow: key = report_id, value = (report_text, timestamp, source_label)
-_multi_report_cache: Dict[str, Tuple[str, float, str]] = {}
 CACHE_TTL = 300.0  # 5 minutes
+# Analysis results: key = (file_path, st_mtime_ns, st_size) so edits to the file invalidate the entry,
+# value = (issues, code, lang, ai_suggestions, generated_tests, report_text); report_text is built on first download
+_results_cache = TTLCache(maxsize=128, ttl=CACHE_TTL)
+# Multi-file reports for the upload flow, one file per report_id so download links survive restarts;
+# the first line holds the JSON-encoded source label, the file's mtime is its age. The directory name carries the
+# uid, so one user's pre-created directory cannot block another's (Windows' temp dir is already per-user)
+_REPORTS_DIR = Path(tempfile.gettempdir()) / (f"compat_reports-{os.getuid()}" if hasattr(os, "getuid") else "compat_reports")
+_REPORT_ID_RE = re.compile(r"[A-Za-z0-9_\-]{1,64}")
+# Path-based multi-file analysis (folder/zip/file list), shared by the results page, its download link and the API:
+# key = _multi_source_key(...), value = (file_issues_list, cross_file_insights, dependency_graph, group_fixes, source_root)
+_multi_results_cache = TTLCache(maxsize=32, ttl=CACHE_TTL)
+# In-flight analyses by _results_cache / _multi_results_cache key, so duplicate requests run the pipeline once
+_inflight = KeyedLocks()
+
+
+# File lists at least this long are validated with concurrent stats
+_PARALLEL_STAT_MIN = 32
+
+# Characters not allowed in download file names (letters, digits, underscore, hyphen are kept)
+_UNSAFE_NAME_RE = re.compile(r"[^\w\-]")
 
 
 def _safe_report_basename(label: str, for_upload: bool = False) -> str:
@@ -62,32 +92,172 @@ def _safe_report_basename(label: str, for_upload: bool = False) -> str:
     # Prefer stem so "my_project.zip" -> "my_project", "main.py" -> "main"
     stem = Path(name).stem or name
     # Sanitize: allow letters, digits, underscore, hyphen; cap length
-    safe = re.sub(r"[^\w\-]", "_", stem)[:80].strip("_") or "report"
+    safe = _UNSAFE_NAME_RE.sub("_", stem)[:80].strip("_") or "report"
     return safe if safe else "compatibility_report"
 
 
+def _reports_dir() -> Path:
+    """_REPORTS_DIR, created if missing; OSError unless it is a real directory private to this user.
+
+    The directory sits in the shared system temp dir, so one planted under this user's name by someone else
+    (or a symlink) is refused rather than used.
+    """
+    try:
+        _REPORTS_DIR.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(_REPORTS_DIR)
+    if not stat.S_ISDIR(st.st_mode):
+        raise OSError(f"{_REPORTS_DIR} is not a directory")
+    # No uid or POSIX modes to check on Windows; the per-user temp dir is already private there
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700):
+        raise OSError(f"{_REPORTS_DIR} must be owned by this user with mode 0700")
+    return _REPORTS_DIR
+
+
+# Expired reports are swept at most once per interval (downloads refuse them regardless)
+_REPORT_SWEEP_INTERVAL = 60.0
+_last_report_sweep = 0.0
+
+
+def _sweep_upload_reports(reports_dir: Path) -> None:
+    """Remove reports older than CACHE_TTL, unless a sweep ran within _REPORT_SWEEP_INTERVAL."""
+    global _last_report_sweep
+    now = time.monotonic()
+    if now - _last_report_sweep < _REPORT_SWEEP_INTERVAL:
+        return
+    _last_report_sweep = now
+    cutoff = time.time() - CACHE_TTL
+    with os.scandir(reports_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _save_upload_report(report_id: str, report_chunks: Iterator[str], source_label: str) -> None:
+    """Write an upload report under _REPORTS_DIR chunk by chunk."""
+    reports_dir = _reports_dir()
+    _sweep_upload_reports(reports_dir)
+    # Write then rename, so a concurrent download never sees a partial report; O_EXCL and O_NOFOLLOW
+    # refuse a pre-existing file or symlink at the temp name
+    tmp = reports_dir / f".{report_id}.tmp"
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+    with os.fdopen(os.open(tmp, flags, 0o600), "wb") as f:
+        try:
+            f.write((json.dumps(source_label) + "\n").encode("utf-8"))
+            for chunk in report_chunks:
+                f.write(chunk.encode("utf-8"))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, reports_dir / f"{report_id}.md")
+
+
+def _open_upload_report(report_id: str) -> Optional[Tuple[BinaryIO, str]]:
+    """(open report body, source_label) for report_id, or None if it is malformed, unknown or expired."""
+    # report_id becomes a file name, so only token_urlsafe characters are accepted
+    if not _REPORT_ID_RE.fullmatch(report_id):
+        return None
+    try:
+        path = _reports_dir() / f"{report_id}.md"
+        if time.time() - path.stat().st_mtime >= CACHE_TTL:
+            path.unlink(missing_ok=True)
+            return None
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        source_label = json.loads(f.readline().decode("utf-8"))
+    except ValueError:
+        f.close()
+        return None
+    return f, source_label
+
+
+def _iter_report_file(f: BinaryIO, block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the rest of an open report file in blocks, closing it at the end."""
+    with f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            yield block
+
+
 def _upload_source_label(
     temp_dir: Optional[Path],
     source_files: List[Path],
     files: List[UploadFile],
 ) -> str:
     """Human-readable label for upload (folder/zip): prefer root folder name over first filename."""
+    fallback = (files[0].filename or "uploaded selection") if files else "uploaded selection"
     if not temp_dir or not source_files:
-        return (files[0].filename or "uploaded selection") if files else "uploaded selection"
-    try:
-        rel_paths = [p.relative_to(temp_dir) for p in source_files]
-    except ValueError:
-        return (files[0].filename or "uploaded selection") if files else "uploaded selection"
-    if not rel_paths:
-        return "uploaded selection"
-    first_parts = [p.parts[0] for p in rel_paths if len(p.parts) >= 1]
-    if first_parts and all(p == first_parts[0] for p in first_parts):
-        return first_parts[0]
+        return fallback
+    # One pass: stop at the first file whose top-level component differs from the first file's
+    first_parts: tuple = ()
+    common: Optional[str] = None
+    for i, p in enumerate(source_files):
+        try:
+            parts = p.relative_to(temp_dir).parts
+        except ValueError:
+            return fallback
+        if i == 0:
+            first_parts = parts
+            common = parts[0] if parts else None
+        elif parts and parts[0] != common:
+            common = None
+            break
+    if common:
+        return common
     # Flat or mixed: use first file's parent dir name if any, else fallback
-    first_rel = rel_paths[0]
-    if first_rel.parts and len(first_rel.parts) > 1:
-        return first_rel.parts[0]
-    return files[0].filename or "uploaded selection"
+    if len(first_parts) > 1:
+        return first_parts[0]
+    return fallback
+
+
+def _single_file_ai(
+    issues: List[IssueOut],
+    code: Optional[str],
+    lang: Optional[str],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Run fix suggestions and test generation concurrently. Returns (ai_suggestions, generated_tests)."""
+    if not issues:
+        # Clean file: nothing to fix or test, skip both LLM round trips
+        return None, None
+    # Repeated prompts (same code and issues, e.g. copies or re-uploads) are answered from AIService's response cache
+    tests_future = _ai_executor.submit(ai_svc.generate_tests, code, lang, issues) if (code and lang) else None
+    ai_suggestions = ai_svc.suggest_fixes(issues, code=code, language=lang)
+    generated_tests = tests_future.result() if tests_future else None
+    return ai_suggestions, generated_tests
+
+
+def _read_code_samples(source_files: List[Path]) -> Dict[Path, str]:
+    """Source of the first readable files, as many as the group-fix prompt quotes."""
+    code_by_file: Dict[Path, str] = {}
+    for file_path in source_files:
+        if len(code_by_file) >= GROUP_CODE_SAMPLE_FILES:
+            break
+        try:
+            code_by_file[file_path] = read_capped(file_path)
+        except Exception:
+            pass
+    return code_by_file
+
+
+def _group_ai(
+    source_files: List[Path],
+    issues_by_file: Dict[Path, List[IssueOut]],
+    dependency_graph: Dict,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Run cross-file insights and group fix suggestions concurrently. Returns (cross_file_insights, group_fixes)."""
+    insights_future = _ai_executor.submit(
+        ai_svc.analyze_group_relationships, source_files, issues_by_file, dependency_graph
+    )
+    group_fixes = ai_svc.suggest_group_fixes(issues_by_file, dependency_graph, _read_code_samples(source_files))
+    return insights_future.result(), group_fixes
 
 
 @router.get("/review", response_class=HTMLResponse)
@@ -96,28 +266,57 @@ def review_get() -> str:
     return RedirectResponse(url="/#review", status_code=302)
 
 
-def _analyze_file(file_path: str, use_cache: bool = True):
-    """Helper to run analysis on a file. Returns (issues, code, lang, ai_suggestions, generated_tests)."""
-    # Check cache first
-    if use_cache and file_path in _results_cache:
-        cached = _results_cache[file_path]
-        issues, code, lang, ai_suggestions, generated_tests, cache_time = cached
-        age = time.time() - cache_time
-        if age < CACHE_TTL:
-            return issues, code, lang, ai_suggestions, generated_tests
-
-    p = Path(file_path)
-    if not p.is_absolute():
-        raise HTTPException(400, "file_path must be absolute")
-    if not p.exists():
-        raise HTTPException(404, f"File not found: {file_path}")
-    req = AnalyzeRequest(file_path=file_path)
-    issues, code, lang = run_check(req)
-    ai_suggestions = ai_svc.suggest_fixes(issues, code=code, language=lang)
-    generated_tests = ai_svc.generate_tests(code or "", lang or "unknown", issues) if (code and lang) else None
+def _stat_or_none(file_path: str) -> Optional[os.stat_result]:
+    """os.stat(file_path), or None if it does not exist or cannot be stat'ed."""
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+
+def _stat_files(paths: List[Path]) -> List[Optional[os.stat_result]]:
+    """_stat_or_none for each path; long lists are stat'ed concurrently (each stat is a round trip on network filesystems)."""
+    if len(paths) < _PARALLEL_STAT_MIN:
+        return [_stat_or_none(str(p)) for p in paths]
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        return list(ex.map(_stat_or_none, map(str, paths)))
+
+
+def _results_key(file_path: str, st: Optional[os.stat_result]) -> Optional[Tuple[str, int, int]]:
+    """_results_cache key for the stat'ed version of file_path, or None if it could not be stat'ed."""
+    if st is None:
+        return None
+    return file_path, st.st_mtime_ns, st.st_size
 
-    # Cache the results
-    _results_cache[file_path] = (issues, code, lang, ai_suggestions, generated_tests, time.time())
+
+def _analyze_file(file_path: str, use_cache: bool = True, st: Optional[os.stat_result] = None):
+    """Helper to run analysis on a file. Returns (issues, code, lang, ai_suggestions, generated_tests).
+
+    st is the caller's os.stat of file_path, if it already has one; the same stat serves as
+    cache key and for check_path's size check.
+    """
+    if st is None:
+        st = _stat_or_none(file_path)
+    key = _results_key(file_path, st)
+    # Check cache first
+    if use_cache and key is not None:
+        cached = _results_cache.get(key)
+        if cached is not None:
+            return cached[:5]
+
+    # Concurrent requests for the same file version wait for the first one and reuse its result
+    with _inflight.hold(key) if key is not None else nullcontext():
+        if use_cache and key is not None:
+            cached = _results_cache.get(key)
+            if cached is not None:
+                return cached[:5]
+
+        issues, code, lang = check_path(Path(file_path), st)
+        ai_suggestions, generated_tests = _single_file_ai(issues, code, lang)
+
+        # Cache the results
+        if key is not None:
+            _results_cache.set(key, (issues, code, lang, ai_suggestions, generated_tests, None))
     return issues, code, lang, ai_suggestions, generated_tests
 
 
@@ -147,54 +346,135 @@ def review_post(
         return render_review_form(error="File path, folder path, or zip path is required.", value="")
 
 
+def _run_multi_file_pipeline(source_files: List[Path], use_ai: bool = True) -> tuple:
+    """Check, graph and (optionally) AI-review a set of files. Returns (file_issues_list, cross_file_insights, dependency_graph, group_fixes)."""
+    # Analyze files; the checker's decoded text is reused for import extraction, then released before the AI calls
+    texts: Dict[Path, str] = {}
+    issues_by_file = checker_svc.analyze_files(source_files, texts)
+    # Detected once, for both the graph and the per-file results
+    languages = {file_path: detect_language(file_path) for file_path in source_files}
+
+    # Build dependency graph
+    dependency_graph = build_dependency_graph(source_files, texts, languages)
+    del texts
+
+    # Get AI insights
+    cross_file_insights = None
+    group_fixes = None
+    # A clean file set gives the group prompts nothing to explain or fix, so skip both LLM round trips
+    if use_ai and any(issues_by_file.values()):
+        cross_file_insights, group_fixes = _group_ai(source_files, issues_by_file, dependency_graph)
+
+    # Format response
+    file_issues_list = [
+        FileIssues(file_path=str(file_path), issues=issues_by_file.get(file_path, []), language=languages[file_path])
+        for file_path in source_files
+    ]
+
+    return file_issues_list, cross_file_insights, dependency_graph, group_fixes
+
+
+def _multi_source_key(
+    p: Optional[Path],
+    source_type: str,
+    source_files: Optional[List[Path]] = None,
+    st: Optional[os.stat_result] = None,
+    file_stats: Optional[List[Optional[os.stat_result]]] = None,
+) -> Optional[str]:
+    """_multi_results_cache key for a folder/zip (or p=None for a file list); changes when any input changes.
+
+    file_stats, if the caller already has them, are the os.stat results of source_files in order.
+    None if an input can no longer be stat'ed (e.g. deleted since the folder walk): the result is not cached.
+    """
+    h = hashlib.blake2b(f"{p or ''}|{source_type}".encode("utf-8"), digest_size=16)
+    if source_files is None:
+        # Archive: its own size/mtime (st, if already taken) cover every member
+        st = st or _stat_or_none(str(p))
+        if st is None:
+            return None
+        h.update(f"|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"))
+    else:
+        for f, st in zip(source_files, file_stats or _stat_files(source_files)):
+            if st is None:
+                return None
+            h.update(f"|{f}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _cached_multi_results(key: Optional[str], compute) -> Optional[tuple]:
+    """_multi_results_cache lookup; on a miss compute() runs once, even when concurrent requests miss together.
+
+    A None key (inputs could not be stat'ed) skips the cache and just computes.
+    """
+    if key is None:
+        return compute()
+    cached = _multi_results_cache.get(key)
+    if cached is not None:
+        return cached
+    with _inflight.hold(key):
+        # Another request may have filled the entry while this one waited
+        cached = _multi_results_cache.get(key)
+        if cached is None:
+            cached = compute()
+            if cached is not None:
+                _multi_results_cache.set(key, cached)
+    return cached
+
+
+def _analyze_archive(p: Path) -> Optional[tuple]:
+    """Extract and analyze an archive, removing the extracted copy afterwards (results hold paths as strings)."""
+    temp_dir, source_files = extract_archive(p)
+    try:
+        if not source_files:
+            return None
+        results = _run_multi_file_pipeline(source_files)
+    finally:
+        cleanup_temp_files(temp_dir)
+    return results + (temp_dir,)
+
+
+def _analyze_source_path(p: Path, source_type: str, st: os.stat_result) -> Optional[tuple]:
+    """Analyze a folder/zip (cached), given its os.stat.
+
+    Returns (file_issues_list, cross_file_insights, dependency_graph, group_fixes, source_root), or None
+    if it has no source files. source_root is the display root for file paths: the folder itself, or the
+    (already removed) directory an archive was extracted into.
+    """
+    if stat.S_ISREG(st.st_mode):
+        # Zips are keyed before extraction so a cache hit skips unpacking entirely
+        return _cached_multi_results(_multi_source_key(p, source_type, st=st), lambda: _analyze_archive(p))
+    source_files = extract_files(p)
+    if not source_files:
+        return None
+    source_root = p if source_type == "folder" else None
+    return _cached_multi_results(
+        _multi_source_key(p, source_type, source_files),
+        lambda: _run_multi_file_pipeline(source_files) + (source_root,),
+    )
+
+
+def _analyze_file_set(source_files: List[Path], file_stats: Optional[List[os.stat_result]] = None) -> tuple:
+    """Analyze an explicit list of files (cached); same result shape as _analyze_source_path."""
+    return _cached_multi_results(
+        _multi_source_key(None, "files", source_files, file_stats=file_stats),
+        lambda: _run_multi_file_pipeline(source_files) + (None,),
+    )
+
+
 def _handle_multi_file_analysis_html(source_path: str, source_type: str) -> str:
     """Handle multi-file analysis and render HTML results."""
-    from ..templates import render_review_multi_results
-    
     try:
         p = Path(source_path)
         if not p.is_absolute():
             return render_review_form(error=f"{source_type.capitalize()} path must be absolute.", value=source_path)
-        if not p.exists():
+        st = _stat_or_none(source_path)
+        if st is None:
             return render_review_form(error=f"{source_type.capitalize()} not found: {source_path}", value=source_path)
         
-        # Extract files
-        if source_type == "folder":
-            source_files = extract_files(p)
-        else:  # zip
-            source_files = extract_files(p)
-        
-        if not source_files:
+        results = _analyze_source_path(p, source_type, st)
+        if results is None:
             return render_review_form(error=f"No source files found in {source_type}: {source_path}", value=source_path)
-        
-        # Analyze files
-        issues_by_file = checker_svc.analyze_files(source_files)
-        
-        # Build dependency graph
-        dependency_graph = build_dependency_graph(source_files)
-        
-        # Read code for AI analysis
-        code_by_file: Dict[Path, str] = {}
-        for file_path in source_files:
-            try:
-                code_by_file[file_path] = file_path.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                pass
-        
-        # Get AI insights
-        cross_file_insights = ai_svc.analyze_group_relationships(source_files, issues_by_file, dependency_graph)
-        group_fixes = ai_svc.suggest_group_fixes(issues_by_file, dependency_graph, code_by_file)
-        
-        # Format response
-        file_issues_list = []
-        for file_path in source_files:
-            issues = issues_by_file.get(file_path, [])
-            language = detect_language(file_path)
-            file_issues_list.append(FileIssues(
-                file_path=str(file_path),
-                issues=issues,
-                language=language,
-            ))
+        file_issues_list, cross_file_insights, dependency_graph, group_fixes, source_root = results
         
         return render_review_multi_results(
             source_path=source_path,
@@ -203,12 +483,29 @@ def _handle_multi_file_analysis_html(source_path: str, source_type: str) -> str:
             cross_file_insights=cross_file_insights,
             dependency_graph=dependency_graph,
             ai_fix_suggestions=group_fixes,
-            source_root=Path(source_path) if source_type == "folder" else None,
+            source_root=source_root,
         )
     except Exception as e:
         return render_review_form(error=f"Error analyzing {source_type}: {str(e)}", value=source_path)
 
 
+def _stream_and_cache_report(
+    key: Optional[Tuple[str, int, int]],
+    file_path: str,
+    issues: List[IssueOut],
+    ai_suggestions: Optional[str],
+    generated_tests: Optional[str],
+):
+    """Yield report sections as they are formatted, then cache the full text for the next download."""
+    chunks = []
+    for chunk in iter_text_report(file_path, issues, ai_suggestions, generated_tests):
+        chunks.append(chunk)
+        yield chunk
+    cached = _results_cache.get(key) if key is not None else None
+    if cached is not None:
+        _results_cache.set(key, cached[:5] + ("".join(chunks),))
+
+
 @router.get("/review/download")
 def review_download(file_path: Optional[str] = Query(None)) -> Response:
     """Download analysis results as a text file. Uses cached results if available. Redirects to / when file_path is missing."""
@@ -216,15 +513,19 @@ def review_download(file_path: Optional[str] = Query(None)) -> Response:
         return RedirectResponse(url="/", status_code=302)
     file_path = file_path.strip()
     try:
-        # Use cache to avoid re-running AI calls
-        issues, code, lang, ai_suggestions, generated_tests = _analyze_file(file_path, use_cache=True)
-        report_text = format_text_report(file_path, issues, ai_suggestions, generated_tests)
         base = _safe_report_basename(Path(file_path).name)
-        filename = f"{base}_compatibility_report.md"
-        return Response(
-            content=report_text,
+        headers = {"Content-Disposition": f'attachment; filename="{base}_compatibility_report.md"'}
+        # Use cache to avoid re-running AI calls and re-formatting the report
+        st = _stat_or_none(file_path)
+        key = _results_key(file_path, st)
+        cached = _results_cache.get(key) if key is not None else None
+        if cached is not None and cached[5] is not None:
+            return Response(content=cached[5], media_type="text/markdown", headers=headers)
+        issues, code, lang, ai_suggestions, generated_tests = _analyze_file(file_path, use_cache=True, st=st)
+        return StreamingResponse(
+            _stream_and_cache_report(key, file_path, issues, ai_suggestions, generated_tests),
             media_type="text/markdown",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            headers=headers,
         )
     except HTTPException:
         raise
@@ -240,84 +541,50 @@ def review_multi_get():
 
 @router.post("/review/multi", response_model=MultiFileAnalyzeResponse)
 def review_multi(req: MultiFileAnalyzeRequest) -> MultiFileAnalyzeResponse:
-    """Multi-file analysis endpoint (API)."""
-    source_files: List[Path] = []
-    temp_dir: Optional[Path] = None
-    
-    try:
-        # Determine source type and extract files
-        if req.folder_path:
-            p = Path(req.folder_path)
-            if not p.is_absolute():
-                raise HTTPException(400, "folder_path must be absolute")
-            if not p.exists() or not p.is_dir():
-                raise HTTPException(404, f"Folder not found: {req.folder_path}")
-            source_files = extract_files(p)
-        elif req.zip_path:
-            p = Path(req.zip_path)
-            if not p.is_absolute():
-                raise HTTPException(400, "zip_path must be absolute")
-            if not p.exists() or not p.is_file():
-                raise HTTPException(404, f"Zip file not found: {req.zip_path}")
-            source_files = extract_files(p)
-            # Find temp directory for cleanup
-            if source_files:
-                temp_dir = source_files[0].parent
-                while temp_dir and not temp_dir.name.startswith('compat_checker_'):
-                    temp_dir = temp_dir.parent
-        elif req.file_paths:
-            source_files = [Path(fp) for fp in req.file_paths]
-            for fp in source_files:
-                if not fp.is_absolute():
-                    raise HTTPException(400, f"File path must be absolute: {fp}")
-                if not fp.exists():
-                    raise HTTPException(404, f"File not found: {fp}")
-        else:
-            raise HTTPException(400, "Provide folder_path, zip_path, or file_paths")
-        
-        if not source_files:
-            raise HTTPException(400, "No source files found")
-        
-        # Analyze files
-        issues_by_file = checker_svc.analyze_files(source_files)
-        
-        # Build dependency graph
-        dependency_graph = build_dependency_graph(source_files)
-        
-        # Read code for AI analysis
-        code_by_file: Dict[Path, str] = {}
-        for file_path in source_files:
-            try:
-                code_by_file[file_path] = file_path.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                pass
-        
-        # Get AI insights
-        cross_file_insights = ai_svc.analyze_group_relationships(source_files, issues_by_file, dependency_graph)
-        group_fixes = ai_svc.suggest_group_fixes(issues_by_file, dependency_graph, code_by_file)
-        
-        # Format response
-        file_issues_list = []
-        for file_path in source_files:
-            issues = issues_by_file.get(file_path, [])
-            language = detect_language(file_path)
-            file_issues_list.append(FileIssues(
-                file_path=str(file_path),
-                issues=issues,
-                language=language,
-            ))
-        
-        return MultiFileAnalyzeResponse(
-            files=file_issues_list,
-            cross_file_insights=cross_file_insights,
-            dependency_graph=dependency_graph,
-            ai_fix_suggestions=group_fixes,
-            generated_tests=None,  # Could add group test generation later
-        )
-    finally:
-        # Cleanup temp files if needed
-        if temp_dir and temp_dir.exists() and temp_dir.name.startswith('compat_checker_'):
-            cleanup_temp_files(temp_dir)
+    """Multi-file analysis endpoint (API). Results are shared with the HTML flow via _multi_results_cache."""
+    # Determine source type and analyze (folders/zips reuse the results page's cache entry)
+    if req.folder_path:
+        p = Path(req.folder_path)
+        if not p.is_absolute():
+            raise HTTPException(400, "folder_path must be absolute")
+        st = _stat_or_none(req.folder_path)
+        if st is None or not stat.S_ISDIR(st.st_mode):
+            raise HTTPException(404, f"Folder not found: {req.folder_path}")
+        results = _analyze_source_path(p, "folder", st)
+    elif req.zip_path:
+        p = Path(req.zip_path)
+        if not p.is_absolute():
+            raise HTTPException(400, "zip_path must be absolute")
+        st = _stat_or_none(req.zip_path)
+        if st is None or not stat.S_ISREG(st.st_mode):
+            raise HTTPException(404, f"Zip file not found: {req.zip_path}")
+        results = _analyze_source_path(p, "zip", st)
+    elif req.file_paths:
+        source_files = [Path(fp) for fp in req.file_paths]
+        for fp in source_files:
+            if not fp.is_absolute():
+                raise HTTPException(400, f"File path must be absolute: {fp}")
+        file_stats = _stat_files(source_files)
+        for fp, st in zip(source_files, file_stats):
+            if st is None:
+                raise HTTPException(404, f"File not found: {fp}")
+            if not stat.S_ISREG(st.st_mode):
+                raise HTTPException(400, f"Not a regular file: {fp}")
+        results = _analyze_file_set(source_files, file_stats)
+    else:
+        raise HTTPException(400, "Provide folder_path, zip_path, or file_paths")
+
+    if results is None:
+        raise HTTPException(400, "No source files found")
+    file_issues_list, cross_file_insights, dependency_graph, group_fixes, _ = results
+
+    return MultiFileAnalyzeResponse(
+        files=file_issues_list,
+        cross_file_insights=cross_file_insights,
+        dependency_graph=dependency_graph,
+        ai_fix_suggestions=group_fixes,
+        generated_tests=None,  # Could add group test generation later
+    )
 
 
 @router.get("/review/results")
@@ -332,8 +599,6 @@ def review_results_post(
     mode: str = Form(default="ai"),
 ) -> str:
     """Handle generic upload (single file, archive, or folder/multi-file). mode=ai (default) or rules."""
-    from ..templates import render_review_multi_results
-
     # Filter out phantom/empty file parts (some browsers send extra parts with empty filename)
     files = [f for f in files if (f.filename or "").strip()]
 
@@ -346,11 +611,13 @@ def review_results_post(
 
     source_files: List[Path] = []
     temp_dir: Optional[Path] = None
+    # Where an uploaded archive was unpacked (kept separate: temp_dir also drives the source label)
+    archive_dir: Optional[Path] = None
 
     try:
         if is_single and first_name.endswith(".zip"):
-            # Single archive: let extract_files handle the uploaded zip directly
-            source_files = extract_files(files[0])
+            # Single archive: unpack the uploaded zip directly
+            archive_dir, source_files = extract_archive(files[0])
         else:
             # One or more regular files / folder selection: build a temp tree then scan it
             temp_dir = build_temp_tree_from_uploads(files)
@@ -368,60 +635,27 @@ def review_results_post(
                 generated_tests = None
                 if mode == "ai":
                     try:
-                        code = single_path.read_text(encoding="utf-8", errors="replace")
+                        code = read_capped(single_path)
                         lang = detect_language(single_path)
                     except Exception:
                         code = None
                         lang = None
-                    ai_suggestions = ai_svc.suggest_fixes(issues, code=code, language=lang)
-                    generated_tests = (
-                        ai_svc.generate_tests(code or "", lang or "unknown", issues)
-                        if (code and lang)
-                        else None
-                    )
+                    ai_suggestions, generated_tests = _single_file_ai(issues, code, lang)
                 return render_review_results(str(single_path), issues, ai_suggestions, generated_tests)
             finally:
-                if temp_dir and temp_dir.exists() and temp_dir.name.startswith("compat_upload_"):
+                if temp_dir:
                     cleanup_temp_files(temp_dir)
 
         # Multi-file analysis flow
-        issues_by_file = checker_svc.analyze_files(source_files)
-
-        # Build dependency graph
-        dependency_graph = build_dependency_graph(source_files)
-
-        cross_file_insights = None
-        group_fixes = None
-        if mode == "ai":
-            code_by_file: Dict[Path, str] = {}
-            for file_path in source_files:
-                try:
-                    code_by_file[file_path] = file_path.read_text(encoding="utf-8", errors="replace")
-                except Exception:
-                    pass
-            cross_file_insights = ai_svc.analyze_group_relationships(
-                source_files, issues_by_file, dependency_graph
-            )
-            group_fixes = ai_svc.suggest_group_fixes(issues_by_file, dependency_graph, code_by_file)
-
-        # Format response
-        file_issues_list = []
-        for file_path in source_files:
-            issues = issues_by_file.get(file_path, [])
-            language = detect_language(file_path)
-            file_issues_list.append(
-                FileIssues(
-                    file_path=str(file_path),
-                    issues=issues,
-                    language=language,
-                )
-            )
+        file_issues_list, cross_file_insights, dependency_graph, group_fixes = _run_multi_file_pipeline(
+            source_files, use_ai=(mode == "ai")
+        )
 
         # Use root folder name for report/download when all files share one parent under temp_dir
         source_label = _upload_source_label(temp_dir, source_files, files)
 
-        # Generate report text and cache it so download works without a filesystem path
-        report_text = format_multi_file_report(
+        # Write the report to disk section by section so download works without a filesystem path
+        report_chunks = iter_multi_file_report(
             source_path=source_label,
             source_type="upload",
             files=file_issues_list,
@@ -429,13 +663,12 @@ def review_results_post(
             dependency_graph=dependency_graph,
             ai_fix_suggestions=group_fixes,
         )
-        report_id = str(uuid.uuid4())
-        now = time.time()
-        _multi_report_cache[report_id] = (report_text, now, source_label)
-        # Evict expired entries
-        for rid in list(_multi_report_cache):
-            if now - _multi_report_cache[rid][1] > CACHE_TTL:
-                del _multi_report_cache[rid]
+        report_id = secrets.token_urlsafe(12)
+        try:
+            _save_upload_report(report_id, report_chunks, source_label)
+        except OSError:
+            # Reports dir unusable: still show the (already paid for) results, just without a download link
+            report_id = None
 
         return render_review_multi_results(
             source_path=source_label,
@@ -451,8 +684,10 @@ def review_results_post(
         return render_review_form(error=f"Error analyzing uploaded selection: {str(e)}", value="")
     finally:
         # Cleanup temp files
-        if temp_dir and temp_dir.exists() and temp_dir.name.startswith("compat_upload_"):
+        if temp_dir:
             cleanup_temp_files(temp_dir)
+        if archive_dir:
+            cleanup_temp_files(archive_dir)
 
 
 @router.get("/review/multi/download")
@@ -462,25 +697,23 @@ def review_multi_download(
     report_id: Optional[str] = Query(None),
 ) -> Response:
     """Download multi-file analysis results as a text file. For uploads use report_id; for path-based use source_path. Redirects to /#review when opened without params."""
-    from ..schemas import FileIssues
-
     if not source_type or not source_type.strip():
         return RedirectResponse(url="/#review", status_code=302)
     source_type = source_type.strip()
 
-    # Upload flow: serve from cache by report_id (no filesystem path)
+    # Upload flow: serve the stored report by report_id (no filesystem path)
     if source_type == "upload" and report_id:
         report_id = report_id.strip()
         if not report_id:
             raise HTTPException(400, "report_id is required for upload download")
-        cached = _multi_report_cache.get(report_id)
-        if not cached:
+        stored = _open_upload_report(report_id)
+        if not stored:
             raise HTTPException(404, "Report expired or not found. Re-run the analysis and download again.")
-        report_text, _, source_label = cached
+        report_file, source_label = stored
         base = _safe_report_basename(source_label)
         filename = f"{base}_compatibility_report.md"
-        return Response(
-            content=report_text,
+        return StreamingResponse(
+            _iter_report_file(report_file),
             media_type="text/markdown",
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
@@ -494,45 +727,18 @@ def review_multi_download(
         p = Path(source_path)
         if not p.is_absolute():
             raise HTTPException(400, "source_path must be absolute")
-        if not p.exists():
+        st = _stat_or_none(source_path)
+        if st is None:
             raise HTTPException(404, f"Source not found: {source_path}")
 
-        # Extract files
-        source_files = extract_files(p)
-        if not source_files:
+        # Reuses the results page's analysis when the sources are unchanged
+        results = _analyze_source_path(p, source_type, st)
+        if results is None:
             raise HTTPException(400, "No source files found")
+        file_issues_list, cross_file_insights, dependency_graph, group_fixes, _ = results
 
-        # Analyze files
-        issues_by_file = checker_svc.analyze_files(source_files)
-
-        # Build dependency graph
-        dependency_graph = build_dependency_graph(source_files)
-
-        # Read code for AI analysis
-        code_by_file: Dict[Path, str] = {}
-        for file_path in source_files:
-            try:
-                code_by_file[file_path] = file_path.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                pass
-
-        # Get AI insights
-        cross_file_insights = ai_svc.analyze_group_relationships(source_files, issues_by_file, dependency_graph)
-        group_fixes = ai_svc.suggest_group_fixes(issues_by_file, dependency_graph, code_by_file)
-
-        # Format response
-        file_issues_list = []
-        for file_path in source_files:
-            issues = issues_by_file.get(file_path, [])
-            language = detect_language(file_path)
-            file_issues_list.append(FileIssues(
-                file_path=str(file_path),
-                issues=issues,
-                language=language,
-            ))
-
-        # Generate report
-        report_text = format_multi_file_report(
+        # Stream the report one section at a time instead of building it in memory
+        report_chunks = iter_multi_file_report(
             source_path=source_path,
             source_type=source_type,
             files=file_issues_list,
@@ -543,8 +749,8 @@ def review_multi_download(
 
         base = _safe_report_basename(Path(source_path).name)
         filename = f"{base}_compatibility_report.md"
-        return Response(
-            content=report_text,
+        return StreamingResponse(
+            report_chunks,
             media_type="text/markdown",
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
@@ -1,12 +1,12 @@
 """Root route."""
 
-from deps import APIRouter, HTMLResponse
-from ..templates import render_homepage
+from deps import APIRouter, HTMLResponse, Response
+from ..templates import render_homepage_bytes
 
 router = APIRouter()
 
 
 @router.get("/", response_class=HTMLResponse)
-def root() -> str:
+def root() -> Response:
     """Root: merged homepage with Review tab containing form."""
-    return render_homepage()
+    return Response(content=render_homepage_bytes(), media_type="text/html; charset=utf-8")
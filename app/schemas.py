@@ -1,6 +1,6 @@
 """Pydantic request/response models."""
 
-from deps import Any, BaseModel, Dict, Field, List, Optional
+from deps import Any, BaseModel, ConfigDict, Dict, Field, List, Optional
 
 
 # --- Request ---
@@ -46,6 +46,9 @@ class IssueOut(BaseModel):
     category: str
     file_path: Optional[str] = Field(default=None, description="File path this issue belongs to (for multi-file analysis)")
 
+    # Issues are shared between cached results and concurrent requests; never mutated after creation
+    model_config = ConfigDict(frozen=True)
+
 
 # --- Responses ---
 
@@ -1,30 +1,127 @@
 """AI service: Together.ai for fix suggestions and test generation."""
 
-from ..config import get_together_api_key, get_together_model
-from deps import Any, Dict, List, OpenAI, Optional, Path
+from ..config import get_ai_max_concurrency, get_together_api_key, get_together_model
+from deps import Any, Dict, hashlib, itertools, List, OpenAI, Optional, Path, re, threading
+from ..ai_status import pooled_client
+from ..cache import KeyedLocks, TTLCache
 from ..schemas import IssueOut
+from ..startup import validate_config
 
 
 def _client() -> Optional[Any]:
-    """Return OpenAI-compatible client for Together.ai, or None if unavailable."""
+    """Return the shared OpenAI-compatible client for Together.ai, or None if unavailable."""
+    validate_config()
     if OpenAI is None:
         return None
     key = get_together_api_key()
     if not key:
         return None
-    return OpenAI(api_key=key, base_url="https://api.together.xyz/v1")
+    # One client (and connection pool) per key, rather than a new pool and TLS handshake per call
+    return pooled_client(key)
+
+
+# Caps Together.ai requests in flight across all handlers and the review-ai executor
+_ai_slots = threading.BoundedSemaphore(get_ai_max_concurrency())
+
+
+# Completion text by request: key = sha256(model, max_tokens, system, prompt). Requests use the provider's default
+# sampling, so a repeat of the same prompt within the hour is answered without another round trip
+_responses = TTLCache(maxsize=512, ttl=3600.0)
+# Concurrent identical requests wait on one upstream call, then read its result from _responses
+_inflight = KeyedLocks()
+
+
+def _complete(client: Any, model: str, system: str, prompt: str, max_tokens: int) -> Optional[str]:
+    """Stripped text of one chat completion, or None if the reply is empty.
+
+    system is the task's fixed instructions and prompt the per-request content, so every call for a task
+    starts with the same tokens (cacheable as a prefix by the provider).
+    Blocks until fewer than AI_MAX_CONCURRENCY calls are in flight; identical requests are served from _responses,
+    and concurrent identical requests share one call.
+    """
+    key = hashlib.sha256(f"{model}|{max_tokens}|{system}|{prompt}".encode("utf-8")).digest()
+    text = _responses.get(key)
+    if text is not None:
+        return text
+    with _inflight.hold(key):
+        # Another caller may have completed the same request while this one waited
+        text = _responses.get(key)
+        if text is not None:
+            return text
+        with _ai_slots:
+            r = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+            )
+        if not (r.choices and r.choices[0].message.content):
+            return None
+        text = r.choices[0].message.content.strip()
+        _responses.set(key, text)
+        return text
+
+
+# A reply wrapped in a markdown code block: opening fence line, body, optional closing fence line
+_FENCE_RE = re.compile(r"\A```[^\n]*\n?(.*?)\n?(?:^[ \t]*```[ \t]*)?\Z", re.DOTALL | re.MULTILINE)
+
+# Files whose source is quoted in the group-fix prompt (first N readable files)
+GROUP_CODE_SAMPLE_FILES = 5
+
+# Source quoted per prompt, in characters: per-file prompts, and per sample file in the group-fix prompt
+CODE_PROMPT_CHARS = 8000
+GROUP_CODE_SAMPLE_CHARS = 2000
+# When source is cut down: leading lines always kept (imports, module setup) and lines kept either side of an issue
+_HEAD_LINES = 20
+_ISSUE_CONTEXT_LINES = 5
+
+
+def _truncate_code(code: str, issues: List[IssueOut], max_chars: int) -> str:
+    """code if it fits in max_chars; otherwise its head and the lines around each issue, gaps marked as elided."""
+    if len(code) <= max_chars:
+        return code
+    lines = code.split("\n")
+    keep = set(range(min(_HEAD_LINES, len(lines))))
+    for i in issues:
+        # line_number is 1-based
+        start = max(0, i.line_number - 1 - _ISSUE_CONTEXT_LINES)
+        keep.update(range(start, min(len(lines), i.line_number + _ISSUE_CONTEXT_LINES)))
+    out: List[str] = []
+    elided = 0
+    for n, line in enumerate(lines):
+        if n not in keep:
+            elided += 1
+            continue
+        if elided:
+            out.append(f"... ({elided} lines elided) ...")
+            elided = 0
+        out.append(line)
+    if elided:
+        out.append(f"... ({elided} lines elided) ...")
+    text = "\n".join(out)
+    if len(text) > max_chars:
+        # Many issues can still overflow the budget: cut at the last whole line that fits
+        cut = text.rfind("\n", 0, max_chars)
+        text = text[:cut] if cut > 0 else text[:max_chars]
+    return text
+
+
+# Output token budget: a per-task base plus OUTPUT_TOKENS_PER_ISSUE per reported issue, up to the task's cap
+OUTPUT_TOKENS_PER_ISSUE = 80
+
+
+def _max_tokens(issue_count: int, base: int, cap: int) -> int:
+    """Output budget for a reply covering issue_count issues: few issues need far fewer tokens than the cap."""
+    return min(cap, base + OUTPUT_TOKENS_PER_ISSUE * issue_count)
 
 
 def _issues_summary(issues: List[IssueOut]) -> str:
     if not issues:
         return "No rule-based issues found."
-    parts = []
-    for i in issues:
-        parts.append(
-            f"- Line {i.line_number} [{i.severity}] {i.category}: {i.message}\n"
-            f"  Code: {i.code}\n  Suggestion: {i.suggestion}"
-        )
-    return "\n".join(parts)
+    return "\n".join([
+        f"- Line {i.line_number} [{i.severity}] {i.category}: {i.message}\n"
+        f"  Code: {i.code}\n  Suggestion: {i.suggestion}"
+        for i in issues
+    ])
 
 
 # Instruction block for evaluating platform-specific code: guarded vs unguarded handling.
@@ -38,6 +135,65 @@ PLATFORM_GUARD_INSTRUCTIONS = (
     "with a single cross-platform path."
 )
 
+# System messages: each task's fixed instructions, sent ahead of the per-request issues and code
+SUGGEST_FIX_SYSTEM = (
+    "You are a cross-platform compatibility expert. You will be given compatibility issues "
+    "reported by a static checker for code that must run on Windows, macOS, and Linux, and "
+    "usually the source code.\n\n"
+    "Provide actionable fix suggestions: either per-issue or overall. Be concise. "
+    "Focus on platform-agnostic APIs (pathlib, os.path.join, platform.system, etc.). "
+    "Use clear bullet points or numbered steps.\n\n"
+    f"{PLATFORM_GUARD_INSTRUCTIONS}\n\n"
+    "Use the provided source to identify issues that fall inside platform-specific guards "
+    "(preprocessor, platform.system(), runtime.GOOS, etc.). For issues inside such blocks: "
+    "evaluate effectiveness and comparison to other platforms; recommend cross-platform "
+    "replacement only when appropriate; otherwise note that the guarded implementation is "
+    "justified. For issues outside guards, suggest fixes as above (prefer platform-agnostic APIs)."
+)
+
+GENERATE_TESTS_SYSTEM = (
+    "You are a cross-platform compatibility expert. Generate test cases that a developer "
+    "can add to their project to verify cross-platform behavior (Windows, macOS, Linux), "
+    "for the source code and reported compatibility issues you are given (fix these or assert "
+    "around them).\n\n"
+    "Provide concrete, runnable test code (e.g. pytest for Python, or platform-specific "
+    "assertions). Include a brief comment explaining what each test checks. Tests may "
+    "assert behavior inside platform guards or document platform-specific branches where "
+    "relevant. Output only the test code, optionally wrapped in a markdown code block."
+)
+
+GROUP_ANALYZE_SYSTEM = (
+    "You are a cross-platform compatibility expert analyzing a multi-file codebase "
+    "that must run on Windows, macOS, and Linux. You will be given issue counts per file "
+    "and the dependency graph.\n\n"
+    "Analyze cross-file compatibility patterns and provide insights:\n"
+    "1. Shared dependencies that may cause cross-platform issues\n"
+    "2. Import path compatibility concerns (Windows vs Unix path separators)\n"
+    "3. Cross-file patterns that could break on different platforms\n"
+    "4. Recommendations for improving cross-platform compatibility across the codebase\n\n"
+    "When code uses platform guards (e.g. #ifdef, platform.system()), note how OS-specific "
+    "blocks are used and whether they are consistent across files.\n\n"
+    "Be concise and actionable. Focus on issues that span multiple files."
+)
+
+GROUP_FIX_SYSTEM = (
+    "You are a cross-platform compatibility expert. You will be given compatibility issues "
+    "found across multiple files in a codebase that must run on Windows, macOS, and Linux, "
+    "their dependency relationships, and sample source code.\n\n"
+    "Provide group-level fix suggestions that consider:\n"
+    "1. How fixes in one file might affect dependent files\n"
+    "2. Cross-file patterns that need coordinated changes\n"
+    "3. Import path fixes that need to be consistent across files\n"
+    "4. Platform-agnostic APIs that should be used consistently\n\n"
+    f"{PLATFORM_GUARD_INSTRUCTIONS}\n\n"
+    "When suggesting fixes, consider which issues are inside platform-specific blocks (using "
+    "the sample source). Evaluate guarded implementations for effectiveness and comparison "
+    "across platforms; prefer cross-platform where it can replace parallel implementations; "
+    "acknowledge when dedicated code is justified.\n\n"
+    "Be specific about which files need changes and in what order. "
+    "Use clear bullet points or numbered steps."
+)
+
 
 class AIService:
     """Together.ai-backed fix suggestions and test generation."""
@@ -54,36 +210,13 @@ class AIService:
             return None
         model = get_together_model()
         summary = _issues_summary(issues)
-        prompt = (
-            "You are a cross-platform compatibility expert. Below are compatibility issues "
-            "reported by a static checker for code that must run on Windows, macOS, and Linux.\n\n"
-            "Issues:\n"
-            f"{summary}\n\n"
-        )
+        prompt = f"Issues:\n{summary}\n"
         if code and language:
-            prompt += f"Source code ({language}):\n```\n{code[:8000]}\n```\n\n"
-        prompt += (
-            "Provide actionable fix suggestions: either per-issue or overall. Be concise. "
-            "Focus on platform-agnostic APIs (pathlib, os.path.join, platform.system, etc.). "
-            "Use clear bullet points or numbered steps.\n\n"
-            f"{PLATFORM_GUARD_INSTRUCTIONS}\n\n"
-            "Use the provided source to identify issues that fall inside platform-specific guards "
-            "(preprocessor, platform.system(), runtime.GOOS, etc.). For issues inside such blocks: "
-            "evaluate effectiveness and comparison to other platforms; recommend cross-platform "
-            "replacement only when appropriate; otherwise note that the guarded implementation is "
-            "justified. For issues outside guards, suggest fixes as above (prefer platform-agnostic APIs)."
-        )
+            prompt += f"\nSource code ({language}):\n```\n{_truncate_code(code, issues, CODE_PROMPT_CHARS)}\n```\n"
         try:
-            r = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2048,
-            )
-            if r.choices and r.choices[0].message.content:
-                return r.choices[0].message.content.strip()
+            return _complete(client, model, SUGGEST_FIX_SYSTEM, prompt, max_tokens=_max_tokens(len(issues), 256, 2048))
         except Exception:
-            pass
-        return None
+            return None
 
     def generate_tests(
         self,
@@ -98,35 +231,18 @@ class AIService:
         model = get_together_model()
         summary = _issues_summary(issues)
         prompt = (
-            "You are a cross-platform compatibility expert. Generate test cases that a developer "
-            "can add to their project to verify cross-platform behavior (Windows, macOS, Linux).\n\n"
             f"Language: {language}\n\n"
-            "Reported compatibility issues (fix these or assert around them):\n"
+            "Reported compatibility issues:\n"
             f"{summary}\n\n"
             "Source code:\n"
-            f"```\n{code[:8000]}\n```\n\n"
-            "Provide concrete, runnable test code (e.g. pytest for Python, or platform-specific "
-            "assertions). Include a brief comment explaining what each test checks. Tests may "
-            "assert behavior inside platform guards or document platform-specific branches where "
-            "relevant. Output only the test code, optionally wrapped in a markdown code block."
+            f"```\n{_truncate_code(code, issues, CODE_PROMPT_CHARS)}\n```\n"
         )
         try:
-            r = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=4096,
-            )
-            if r.choices and r.choices[0].message.content:
-                text = r.choices[0].message.content.strip()
+            text = _complete(client, model, GENERATE_TESTS_SYSTEM, prompt, max_tokens=_max_tokens(len(issues), 1024, 4096))
+            if text:
                 # Strip markdown code block if present
-                if text.startswith("```"):
-                    lines = text.split("\n")
-                    if lines[0].startswith("```"):
-                        lines = lines[1:]
-                    if lines and lines[-1].strip() == "```":
-                        lines = lines[:-1]
-                    text = "\n".join(lines)
-                return text
+                m = _FENCE_RE.match(text)
+                return m.group(1) if m else text
         except Exception:
             pass
         return None
@@ -171,8 +287,6 @@ class AIService:
         graph_summary = self._format_graph_for_prompt(dependency_graph)
         
         prompt = (
-            "You are a cross-platform compatibility expert analyzing a multi-file codebase "
-            "that must run on Windows, macOS, and Linux.\n\n"
             f"Total files analyzed: {len(files)}\n"
             f"Total issues found: {total_issues}\n\n"
             "Issues by file:\n"
@@ -180,29 +294,12 @@ class AIService:
         for summary in file_summaries:
             prompt += f"  - {summary}\n"
         
-        prompt += f"\n{graph_summary}\n\n"
-        prompt += (
-            "Analyze cross-file compatibility patterns and provide insights:\n"
-            "1. Shared dependencies that may cause cross-platform issues\n"
-            "2. Import path compatibility concerns (Windows vs Unix path separators)\n"
-            "3. Cross-file patterns that could break on different platforms\n"
-            "4. Recommendations for improving cross-platform compatibility across the codebase\n\n"
-            "When code uses platform guards (e.g. #ifdef, platform.system()), note how OS-specific "
-            "blocks are used and whether they are consistent across files.\n\n"
-            "Be concise and actionable. Focus on issues that span multiple files."
-        )
+        prompt += f"\n{graph_summary}\n"
         
         try:
-            r = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2048,
-            )
-            if r.choices and r.choices[0].message.content:
-                return r.choices[0].message.content.strip()
+            return _complete(client, model, GROUP_ANALYZE_SYSTEM, prompt, max_tokens=_max_tokens(total_issues, 512, 2048))
         except Exception:
-            pass
-        return None
+            return None
     
     def suggest_group_fixes(
         self,
@@ -227,58 +324,32 @@ class AIService:
         model = get_together_model()
         
         # Build comprehensive issue summary
-        all_issues: List[IssueOut] = []
-        for issues in issues_by_file.values():
-            all_issues.extend(issues)
-        
+        all_issues = list(itertools.chain.from_iterable(issues_by_file.values()))
         issues_summary = _issues_summary(all_issues)
         
         # Format code samples (limit to first few files to avoid token limits)
         code_samples = []
-        for file_path, code in list(code_by_file.items())[:5]:
+        for file_path, code in list(code_by_file.items())[:GROUP_CODE_SAMPLE_FILES]:
             file_name = file_path.name
-            code_samples.append(f"\n{file_name}:\n```\n{code[:2000]}\n```")
+            sample = _truncate_code(code, issues_by_file.get(file_path, []), GROUP_CODE_SAMPLE_CHARS)
+            code_samples.append(f"\n{file_name}:\n```\n{sample}\n```")
         
         graph_summary = self._format_graph_for_prompt(dependency_graph)
         
         prompt = (
-            "You are a cross-platform compatibility expert. Below are compatibility issues "
-            "found across multiple files in a codebase that must run on Windows, macOS, and Linux.\n\n"
             "Issues:\n"
             f"{issues_summary}\n\n"
             "Dependency relationships:\n"
-            f"{graph_summary}\n\n"
+            f"{graph_summary}\n"
         )
         
         if code_samples:
-            prompt += "Sample source code:\n" + "\n".join(code_samples) + "\n\n"
-        
-        prompt += (
-            "Provide group-level fix suggestions that consider:\n"
-            "1. How fixes in one file might affect dependent files\n"
-            "2. Cross-file patterns that need coordinated changes\n"
-            "3. Import path fixes that need to be consistent across files\n"
-            "4. Platform-agnostic APIs that should be used consistently\n\n"
-            f"{PLATFORM_GUARD_INSTRUCTIONS}\n\n"
-            "When suggesting fixes, consider which issues are inside platform-specific blocks (using "
-            "the sample source). Evaluate guarded implementations for effectiveness and comparison "
-            "across platforms; prefer cross-platform where it can replace parallel implementations; "
-            "acknowledge when dedicated code is justified.\n\n"
-            "Be specific about which files need changes and in what order. "
-            "Use clear bullet points or numbered steps."
-        )
+            prompt += "\nSample source code:\n" + "\n".join(code_samples) + "\n"
         
         try:
-            r = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=4096,
-            )
-            if r.choices and r.choices[0].message.content:
-                return r.choices[0].message.content.strip()
+            return _complete(client, model, GROUP_FIX_SYSTEM, prompt, max_tokens=_max_tokens(len(all_issues), 512, 4096))
         except Exception:
-            pass
-        return None
+            return None
     
     def _format_graph_for_prompt(self, dependency_graph: Dict) -> str:
         """Format dependency graph for LLM prompt. Uses full file paths so the AI can distinguish same-named files (e.g. app/utils.py vs tests/utils.py) and avoid falsely reporting self-imports."""
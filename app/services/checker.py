@@ -1,14 +1,14 @@
 """Checker service: wraps cross_platform_checker and maps to API models."""
 
-from ..config import ensure_checker_import_path
-from deps import Dict, List, Path, Tuple, tempfile
+from ..config import ensure_checker_import_path, get_checker_processes
+from deps import Dict, List, multiprocessing, Optional, Path, ProcessPoolExecutor, threading, Tuple, tempfile
 from ..schemas import IssueOut
 
 ensure_checker_import_path()
 
 from cross_platform_checker.main_checker import CrossPlatformChecker
 from cross_platform_checker.issue import Issue
-from .file_extractor import extract_files, cleanup_temp_files
+from .file_extractor import extract_archive, extract_files, cleanup_temp_files
 
 _LANG_TO_EXT = {
     "python": ".py",
@@ -28,6 +28,43 @@ _LANG_TO_EXT = {
 }
 
 
+# File sets at least this large are checked in worker processes (the rules are CPU-bound and hold the GIL)
+PARALLEL_MIN_FILES = 64
+# Files per task sent to a worker, so pickling overhead stays small relative to the checking
+_FILES_PER_TASK = 16
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _check_chunk(file_paths: List[Path], want_texts: bool) -> Tuple[Dict[Path, List[Issue]], Optional[Dict[Path, str]]]:
+    """Worker-process entry point: check a slice of files. Returns (issues by file, texts if wanted)."""
+    texts: Optional[Dict[Path, str]] = {} if want_texts else None
+    return CrossPlatformChecker().check_files(file_paths, texts), texts
+
+
+def _process_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared checker process pool, started on first use; None when only one process is configured."""
+    global _pool
+    workers = get_checker_processes()
+    if workers < 2:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs request threads can copy locks held by other threads
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the checker worker processes (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
 def _issue_to_out(i: Issue, file_path: str = None) -> IssueOut:
     return IssueOut(
         severity=i.severity.value,
@@ -66,17 +103,26 @@ class CheckerService:
         issues = CrossPlatformChecker().check_file(file_path)
         return [_issue_to_out(i) for i in issues]
     
-    def analyze_files(self, file_paths: List[Path]) -> Dict[Path, List[IssueOut]]:
-        """Run rule-based checks on multiple files.
+    def analyze_files(self, file_paths: List[Path], texts: Optional[Dict[Path, str]] = None) -> Dict[Path, List[IssueOut]]:
+        """Run rule-based checks on multiple files (in worker processes for PARALLEL_MIN_FILES or more).
         
         Args:
             file_paths: List of file paths to analyze
+            texts: Optional dict filled with each file's decoded content as it is read
             
         Returns:
             Dictionary mapping file path to list of issues
         """
-        checker = CrossPlatformChecker()
-        issues_by_file = checker.check_files(file_paths)
+        pool = _process_pool() if len(file_paths) >= PARALLEL_MIN_FILES else None
+        if pool is None:
+            issues_by_file = CrossPlatformChecker().check_files(file_paths, texts)
+        else:
+            issues_by_file = {}
+            chunks = [file_paths[i:i + _FILES_PER_TASK] for i in range(0, len(file_paths), _FILES_PER_TASK)]
+            for chunk_issues, chunk_texts in pool.map(_check_chunk, chunks, [texts is not None] * len(chunks)):
+                issues_by_file.update(chunk_issues)
+                if texts is not None:
+                    texts.update(chunk_texts)
         
         # Convert to IssueOut format
         result: Dict[Path, List[IssueOut]] = {}
@@ -108,21 +154,7 @@ class CheckerService:
         Returns:
             Tuple of (issues dictionary, temp directory path for cleanup)
         """
-        source_files = extract_files(zip_path)
-        
-        # Find the temp directory (parent of first extracted file)
-        temp_dir = None
-        if source_files:
-            # All extracted files should be under the same temp directory
-            temp_dir = source_files[0].parent
-            # Walk up to find the actual temp extraction root
-            while temp_dir and not temp_dir.name.startswith('compat_checker_'):
-                temp_dir = temp_dir.parent
-            if temp_dir is None:
-                temp_dir = source_files[0].parent
-        
+        temp_dir, source_files = extract_archive(zip_path)
         if not source_files:
-            return {}, temp_dir or Path(tempfile.gettempdir())
-        
-        issues = self.analyze_files(source_files)
-        return issues, temp_dir or Path(tempfile.gettempdir())
+            return {}, temp_dir
+        return self.analyze_files(source_files), temp_dir
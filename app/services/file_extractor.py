@@ -1,6 +1,6 @@
 """File extraction service: handles folders and zip files."""
 
-from deps import List, Path, Union, tempfile, zipfile
+from deps import List, os, Path, shutil, Tuple, Union, tempfile, zipfile
 from starlette.datastructures import UploadFile as StarletteUploadFile
 
 
@@ -53,11 +53,11 @@ def extract_files(source: Union[str, Path, StarletteUploadFile]) -> List[Path]:
         List of absolute paths to source files found
     """
     if isinstance(source, StarletteUploadFile):
-        return _extract_from_uploaded_zip(source)
+        return _extract_from_uploaded_zip(source)[1]
     elif isinstance(source, (str, Path)):
         path = Path(source)
         if path.is_file() and path.suffix.lower() == '.zip':
-            return _extract_from_zip_path(path)
+            return _extract_from_zip_path(path)[1]
         elif path.is_dir():
             return _extract_from_folder(path)
         else:
@@ -71,47 +71,82 @@ def _extract_from_folder(folder_path: Path) -> List[Path]:
     source_files: List[Path] = []
     folder_path = folder_path.resolve()
 
-    for file_path in folder_path.rglob("*"):
-        if not file_path.is_file():
-            continue
-        # Check if in excluded directory
-        if any(excluded in file_path.parts for excluded in EXCLUDE_DIRS):
-            continue
-        # Check if has source file extension
-        if file_path.suffix.lower() in SOURCE_EXTENSIONS:
-            source_files.append(file_path.resolve())
+    # scandir walk: excluded directories are pruned instead of walked, entries carry their file
+    # type, and only files with a source extension become Path objects
+    pending = [str(folder_path)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue  # Unreadable subdirectory
+        with entries:
+            for entry in entries:
+                # Symlinked directories are not followed
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDE_DIRS:
+                        pending.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in SOURCE_EXTENSIONS and entry.is_file():
+                    file_path = Path(entry.path)
+                    source_files.append(file_path.resolve() if entry.is_symlink() else file_path)
 
     return sorted(source_files)
 
 
-def _extract_from_zip_path(zip_path: Path) -> List[Path]:
-    """Extract source files from a zip file path."""
+def _extract_source_members(zip_ref: zipfile.ZipFile, dest: Path) -> None:
+    """Extract only source-file members into dest; other entries are never written to disk."""
+    for info in zip_ref.infolist():
+        if info.is_dir() or Path(info.filename).suffix.lower() not in SOURCE_EXTENSIONS:
+            continue
+        # ZipFile.extract streams the member and sanitizes absolute / ".." names like extractall
+        zip_ref.extract(info, dest)
+
+
+def _extract_from_zip_path(zip_path: Path) -> Tuple[Path, List[Path]]:
+    """Extract source files from a zip file path. Returns (temp_dir, source_files)."""
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
         temp_dir = Path(tempfile.mkdtemp(prefix='compat_checker_'))
-        zip_ref.extractall(temp_dir)
-        return _extract_from_folder(temp_dir)
+        try:
+            _extract_source_members(zip_ref, temp_dir)
+        except BaseException:
+            cleanup_temp_files(temp_dir)
+            raise
+        return temp_dir, _extract_from_folder(temp_dir)
 
 
-def _extract_from_uploaded_zip(upload_file: StarletteUploadFile) -> List[Path]:
-    """Extract source files from an uploaded zip file."""
+def _extract_from_uploaded_zip(upload_file: StarletteUploadFile) -> Tuple[Path, List[Path]]:
+    """Extract source files from an uploaded zip file. Returns (temp_dir, source_files)."""
     temp_dir = Path(tempfile.mkdtemp(prefix='compat_checker_'))
     
-    # Save uploaded file to temp location
-    temp_zip = temp_dir / upload_file.filename
-    with open(temp_zip, 'wb') as f:
-        content = upload_file.file.read()
-        f.write(content)
-    
-    # Extract zip
-    with zipfile.ZipFile(temp_zip, 'r') as zip_ref:
-        extract_dir = temp_dir / 'extracted'
-        extract_dir.mkdir()
-        zip_ref.extractall(extract_dir)
+    # Read the archive straight from the upload's spooled file (no temp copy of the zip)
+    try:
+        upload_file.file.seek(0)
+        with zipfile.ZipFile(upload_file.file, 'r') as zip_ref:
+            extract_dir = temp_dir / 'extracted'
+            extract_dir.mkdir()
+            _extract_source_members(zip_ref, extract_dir)
+    except BaseException:
+        cleanup_temp_files(temp_dir)
+        raise
     
     # Find source files
     source_files = _extract_from_folder(extract_dir)
     
-    return source_files
+    return temp_dir, source_files
+
+
+def extract_archive(source: Union[str, Path, StarletteUploadFile]) -> Tuple[Path, List[Path]]:
+    """Extract a zip file path or uploaded zip into a new compat_checker_* temp directory.
+    
+    Returns:
+        (temp_dir, source_files); the caller removes temp_dir with cleanup_temp_files, even when
+        no source files were found
+    """
+    if isinstance(source, StarletteUploadFile):
+        return _extract_from_uploaded_zip(source)
+    path = Path(source)
+    if path.suffix.lower() != '.zip':
+        raise ValueError(f"Source must be a folder or zip file: {path}")
+    return _extract_from_zip_path(path)
 
 
 def cleanup_temp_files(temp_dir: Path) -> None:
@@ -120,7 +155,6 @@ def cleanup_temp_files(temp_dir: Path) -> None:
     Args:
         temp_dir: Path to temporary directory to remove
     """
-    import shutil
     try:
         shutil.rmtree(temp_dir)
     except Exception:
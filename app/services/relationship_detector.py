@@ -1,7 +1,7 @@
 """Relationship detector: analyzes imports and dependencies between files."""
 
 from ..config import ensure_checker_import_path
-from deps import Dict, List, Path, Set
+from deps import Dict, List, Optional, Path, Set
 
 ensure_checker_import_path()
 
@@ -26,11 +26,17 @@ def detect_imports(file_path: Path, language: str = None) -> List[str]:
     return checker._extract_imports(file_path, language)
 
 
-def build_dependency_graph(files: List[Path]) -> Dict[str, Dict]:
+def build_dependency_graph(
+    files: List[Path],
+    texts: Optional[Dict[Path, str]] = None,
+    languages: Optional[Dict[Path, str]] = None,
+) -> Dict[str, Dict]:
     """Build dependency graph from file imports.
     
     Args:
         files: List of file paths to analyze
+        texts: Optional already-read file contents (e.g. from CheckerService.analyze_files); others are read from disk
+        languages: Optional already-detected language per file; others are detected here
         
     Returns:
         Dictionary mapping file path (str) to:
@@ -43,10 +49,12 @@ def build_dependency_graph(files: List[Path]) -> Dict[str, Dict]:
     file_set = set(files)
     graph: Dict[str, Dict] = {}
     
-    # Initialize graph entries
+    # Initialize graph entries (resolve and detect language once per file)
+    entries = []
     for file_path in files:
         file_str = str(file_path.resolve())
-        language = detect_language(file_path)
+        language = languages[file_path] if languages and file_path in languages else detect_language(file_path)
+        entries.append((file_path, file_str, language))
         graph[file_str] = {
             "imports": [],
             "imported_by": [],
@@ -55,13 +63,12 @@ def build_dependency_graph(files: List[Path]) -> Dict[str, Dict]:
     
     # Build import relationships
     checker = CrossPlatformChecker()
-    for file_path in files:
-        file_str = str(file_path.resolve())
-        language = detect_language(file_path)
-        imports = checker._extract_imports(file_path, language)
+    index = checker._import_index(file_set)
+    for file_path, file_str, language in entries:
+        imports = checker._extract_imports(file_path, language, texts.get(file_path) if texts else None)
         
         for imp in imports:
-            resolved = checker._resolve_import(imp, file_path, file_set)
+            resolved = checker._resolve_import(imp, file_path, file_set, index)
             if resolved:
                 resolved_str = str(resolved.resolve())
                 if resolved_str in graph:
@@ -116,10 +123,13 @@ def format_relationship_summary(graph: Dict[str, Dict]) -> str:
 def _detect_circular_dependencies(graph: Dict[str, Dict]) -> List[List[str]]:
     """Detect circular dependencies using DFS."""
     circular: List[List[str]] = []
+    seen_cycles: Set[tuple] = set()
     visited: Set[str] = set()
     rec_stack: Set[str] = set()
+    # Current DFS path, shared across calls (append on enter, pop on exit)
+    path: List[str] = []
     
-    def dfs(node: str, path: List[str]) -> None:
+    def dfs(node: str) -> None:
         if node in rec_stack:
             # Found cycle
             cycle_start = path.index(node)
@@ -127,7 +137,9 @@ def _detect_circular_dependencies(graph: Dict[str, Dict]) -> List[List[str]]:
             # Normalize cycle (start from lexicographically first node)
             cycle_start_idx = min(range(len(cycle) - 1), key=lambda i: cycle[i])
             normalized_cycle = cycle[cycle_start_idx:-1] + [cycle[cycle_start_idx]]
-            if normalized_cycle not in circular:
+            key = tuple(normalized_cycle)
+            if key not in seen_cycles:
+                seen_cycles.add(key)
                 circular.append(normalized_cycle)
             return
         
@@ -136,16 +148,18 @@ def _detect_circular_dependencies(graph: Dict[str, Dict]) -> List[List[str]]:
         
         visited.add(node)
         rec_stack.add(node)
+        path.append(node)
         
         if node in graph:
             for neighbor in graph[node].get("imports", []):
                 if neighbor in graph:
-                    dfs(neighbor, path + [node])
+                    dfs(neighbor)
         
+        path.pop()
         rec_stack.remove(node)
     
     for node in graph:
         if node not in visited:
-            dfs(node, [])
+            dfs(node)
     
     return circular
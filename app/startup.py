@@ -1,11 +1,22 @@
 """Startup validation and configuration checks."""
 
 from .config import get_together_api_key
-from deps import Path
+from deps import functools, os, Path, threading
+
+_lock = threading.Lock()
 
 
 def validate_config() -> None:
-    """Validate config at startup and warn if .env or TOGETHER_API_KEY missing."""
+    """Warn once, on first AI use, if .env or TOGETHER_API_KEY is missing. SKIP_STARTUP_VALIDATION=1 silences it."""
+    # Concurrent first AI calls must not print the warning twice
+    with _lock:
+        _warn_if_misconfigured()
+
+
+@functools.cache
+def _warn_if_misconfigured() -> None:
+    if os.environ.get("SKIP_STARTUP_VALIDATION"):
+        return
     env_file = Path(".env")
     env_exists = env_file.exists()
     key = get_together_api_key()
@@ -2,12 +2,27 @@
 
 from ..ai_status import get_ai_status
 import re
-from deps import Any, Dict, html, json, List, Optional, os, Path, quote
+from deps import Any, Dict, functools, json, List, Optional, os, Path, quote
 from ..schemas import FileIssues
 
 TEMPLATES_DIR = Path(__file__).parent
 
+# Must match html.escape(s, quote=True), applied in one pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
 
+
+def _esc(s: str) -> str:
+    """HTML-escape text for element content and quoted attributes."""
+    return s.translate(_HTML_ESCAPE_TABLE)
+
+
+@functools.lru_cache(maxsize=128)
 def _format_display_category(category: str) -> str:
     """Pretty-print category for display (e.g. DEPRECATION -> Deprecation)."""
     if not category:
@@ -15,6 +30,7 @@ def _format_display_category(category: str) -> str:
     return category.replace("_", " ").strip().lower().title()
 
 
+@functools.lru_cache(maxsize=16)
 def _format_display_severity(severity: str) -> str:
     """Pretty-print severity for display (e.g. ERROR -> Error)."""
     if not severity:
@@ -40,7 +56,7 @@ def _ai_content_to_html(text: str) -> str:
     """Convert AI-generated plain text (possibly markdown-like) to safe, readable HTML."""
     if not text:
         return ""
-    esc = html.escape
+    esc = _esc
     parts = text.split("```")
     out = []
     for i, part in enumerate(parts):
@@ -102,7 +118,7 @@ def _ai_content_to_html(text: str) -> str:
 def _render_ai_status_banner() -> str:
     """Generate AI status banner HTML."""
     status = get_ai_status()
-    esc = html.escape
+    esc = _esc
     
     if status["available"]:
         icon = "✓"
@@ -122,8 +138,9 @@ def _render_ai_status_banner() -> str:
     return f'<div class="ai-status {cls}"><span class="ai-status-icon">{icon}</span><span class="ai-status-text">{msg}</span></div>'
 
 
+@functools.lru_cache(maxsize=None)
 def load_template(name: str) -> str:
-    """Load a template file."""
+    """Load a template file (read from disk once per process)."""
     path = TEMPLATES_DIR / name
     return path.read_text(encoding="utf-8")
 
@@ -138,19 +155,30 @@ def render_ai_status_banner() -> str:
     return _render_ai_status_banner()
 
 
+@functools.lru_cache(maxsize=1)
+def _base_shell() -> tuple:
+    """base.html with the CSS inlined, split into the static text around {title}, {ai_status_banner} and {content}."""
+    base = load_template("base.html").replace("{css}", load_css())
+    head, rest = base.split("{title}", 1)
+    mid, rest = rest.split("{ai_status_banner}", 1)
+    pre_content, tail = rest.split("{content}", 1)
+    return head, mid, pre_content, tail
+
+
 def render_template(template_name: str, omit_global_ai_banner: bool = False, **kwargs) -> str:
     """Render a template with the given variables."""
     template = load_template(template_name)
-    css = load_css()
-    base = load_template("base.html")
     content = template.format(**kwargs)
-    # Use string replacement for base template to avoid CSS brace conflicts
+    # Fill the pre-split base shell directly to avoid CSS brace conflicts and per-request replace passes
     title_val = kwargs.get("title", "Compatibility Checker")
     ai_banner = "" if omit_global_ai_banner else _render_ai_status_banner()
-    result = base.replace("{title}", title_val).replace("{css}", css).replace("{ai_status_banner}", ai_banner).replace("{content}", content)
-    return result
+    head, mid, pre_content, tail = _base_shell()
+    return "".join((head, title_val, mid, ai_banner, pre_content, content, tail))
 
 
+# Characters not allowed in download file names (letters, digits, underscore, hyphen are kept)
+_UNSAFE_NAME_RE = re.compile(r"[^\w\-]")
+
 # C-family languages shown as one combined box in the language grid
 _C_FAMILY_GROUP = ("C", "C++", "C#")
 _C_FAMILY_LABEL = "C / C++ / C#"
@@ -162,7 +190,7 @@ def _render_reviewable_languages_grid() -> str:
         FULL_SUPPORT_LANGUAGE_NAMES_SORTED,
         PARTIAL_SUPPORT_LANGUAGE_NAMES,
     )
-    esc = html.escape
+    esc = _esc
     # Full support: C, C++, C# in one box; rest as individual tags
     full_display = [n for n in FULL_SUPPORT_LANGUAGE_NAMES_SORTED if n not in _C_FAMILY_GROUP]
     full_display.insert(0, _C_FAMILY_LABEL)
@@ -188,8 +216,8 @@ def _render_reviewable_languages_grid() -> str:
 
 def render_review_form_fragment(error: Optional[str] = None, value: str = "") -> str:
     """Return only the review form content (no base layout), for embedding in the homepage tab."""
-    error_block = f'<div class="form-error">{html.escape(error)}</div>' if error else ""
-    value_attr = f' value="{html.escape(value)}"' if value else ""
+    error_block = f'<div class="form-error">{_esc(error)}</div>' if error else ""
+    value_attr = f' value="{_esc(value)}"' if value else ""
     reviewable_languages_html = _render_reviewable_languages_grid()
     template = load_template("review_form.html")
     return template.format(
@@ -201,8 +229,21 @@ def render_review_form_fragment(error: Optional[str] = None, value: str = "") ->
 
 def render_homepage(review_tab_open: bool = False, form_error: Optional[str] = None) -> str:
     """Render the merged homepage with optional review tab open and form error message."""
+    return _render_homepage(review_tab_open, form_error, _render_ai_status_banner())
+
+
+def render_homepage_bytes() -> bytes:
+    """Default homepage as UTF-8 bytes; only the AI status banner varies between requests."""
+    return _homepage_bytes(_render_ai_status_banner())
+
+
+@functools.lru_cache(maxsize=8)
+def _homepage_bytes(ai_status_banner: str) -> bytes:
+    return _render_homepage(False, None, ai_status_banner).encode("utf-8")
+
+
+def _render_homepage(review_tab_open: bool, form_error: Optional[str], ai_status_banner: str) -> str:
     review_form_content = render_review_form_fragment(error=form_error)
-    ai_status_banner = _render_ai_status_banner()
     review_tab_attr = "" if review_tab_open else "hidden"
     return render_template(
         "root.html",
@@ -216,8 +257,8 @@ def render_homepage(review_tab_open: bool = False, form_error: Optional[str] = N
 
 def render_review_form(error: Optional[str] = None, value: str = "") -> str:
     """Render the review form template."""
-    error_block = f'<div class="form-error">{html.escape(error)}</div>' if error else ""
-    value_attr = f' value="{html.escape(value)}"' if value else ""
+    error_block = f'<div class="form-error">{_esc(error)}</div>' if error else ""
+    value_attr = f' value="{_esc(value)}"' if value else ""
     reviewable_languages_html = _render_reviewable_languages_grid()
     return render_template(
         "review_form.html",
@@ -227,6 +268,35 @@ def render_review_form(error: Optional[str] = None, value: str = "") -> str:
     )
 
 
+_SEV_CLASS = {"ERROR": "error", "WARNING": "warning"}
+
+# One issue card; {pad} is the indentation of the enclosing block
+_ISSUE_TEMPLATE = """
+{pad}<div class="issue {cls}">
+{pad}  <div class="issue-meta">Line {line} · {category} · <span class="issue-severity-pill issue-severity-{cls}">{severity}</span></div>
+{pad}  <div class="issue-msg">{message}</div>
+{pad}  <div class="issue-code">Code: {code}</div>
+{pad}  <div class="issue-fix">Fix: {suggestion}</div>
+{pad}</div>"""
+
+
+def _render_issue_cards(issues: list, pad: str) -> str:
+    """HTML issue cards for the results pages, joined in a single pass."""
+    return "".join([
+        _ISSUE_TEMPLATE.format(
+            pad=pad,
+            cls=_SEV_CLASS.get(i.severity, "info"),
+            line=i.line_number,
+            category=_esc(_format_display_category(getattr(i, "category", "") or "")),
+            severity=_esc(_format_display_severity(getattr(i, "severity", "") or "")),
+            message=_esc(i.message),
+            code=_esc(i.code),
+            suggestion=_esc(i.suggestion),
+        )
+        for i in issues
+    ])
+
+
 def render_review_results(
     file_path: str,
     issues: list,
@@ -236,20 +306,9 @@ def render_review_results(
 ) -> str:
     """Render the review results template."""
     
-    esc = html.escape
+    esc = _esc
     error_block = f'<div class="form-error">{esc(error)}</div>' if error else ""
-    issues_block = ""
-    for i in issues:
-        cls = "error" if i.severity == "ERROR" else "warning" if i.severity == "WARNING" else "info"
-        cat_display = _format_display_category(getattr(i, "category", "") or "")
-        sev_display = _format_display_severity(getattr(i, "severity", "") or "")
-        issues_block += f"""
-  <div class="issue {cls}">
-    <div class="issue-meta">Line {i.line_number} · {esc(cat_display)} · <span class="issue-severity-pill issue-severity-{cls}">{esc(sev_display)}</span></div>
-    <div class="issue-msg">{esc(i.message)}</div>
-    <div class="issue-code">Code: {esc(i.code)}</div>
-    <div class="issue-fix">Fix: {esc(i.suggestion)}</div>
-  </div>"""
+    issues_block = _render_issue_cards(issues, "  ")
     if not issues_block:
         issues_block = "<p>No issues found.</p>"
     issues_block = f"""<details class="collapsible-section" open>
@@ -335,7 +394,7 @@ def render_review_multi_results(
     source_root: Optional[Path] = None,
 ) -> str:
     """Render the multi-file review results template."""
-    esc = html.escape
+    esc = _esc
     
     error_block = f'<div class="form-error">{esc(error)}</div>' if error else ""
     
@@ -435,7 +494,7 @@ def render_review_multi_results(
 </details>"""
     
     # Files block - issues grouped by file (collapsible section with per-file collapsibles)
-    files_block = ""
+    file_sections = []
     for file_issues in files:
         fp = Path(file_issues.file_path).resolve()
         if display_root and str(fp).startswith(str(display_root)):
@@ -464,21 +523,10 @@ def render_review_multi_results(
             if info_count:
                 badge_parts.append(f'<span class="issue-badge issue-badge-info">Info: {info_count}</span>')
             badges_html = "".join(badge_parts)
-            issues_html = ""
-            for i in issues:
-                cls = "error" if i.severity == "ERROR" else "warning" if i.severity == "WARNING" else "info"
-                cat_display = _format_display_category(getattr(i, "category", "") or "")
-                sev_display = _format_display_severity(getattr(i, "severity", "") or "")
-                issues_html += f"""
-    <div class="issue {cls}">
-      <div class="issue-meta">Line {i.line_number} · {esc(cat_display)} · <span class="issue-severity-pill issue-severity-{cls}">{esc(sev_display)}</span></div>
-      <div class="issue-msg">{esc(i.message)}</div>
-      <div class="issue-code">Code: {esc(i.code)}</div>
-      <div class="issue-fix">Fix: {esc(i.suggestion)}</div>
-    </div>"""
+            issues_html = _render_issue_cards(issues, "    ")
             issue_count = len(issues)
             file_name_html = f'<span class="file-path-folder">{esc(folder_part)}</span><span class="file-path-name">{esc(name_part)}</span> <span class="file-path-lang">({esc(language)})</span>'
-            files_block += f"""
+            file_sections.append(f"""
   <details class="file-collapsible" data-issue-count="{issue_count}" data-file-path="{esc(file_display)}">
     <summary>
       <span class="file-summary-inner">
@@ -491,10 +539,10 @@ def render_review_multi_results(
 {issues_html}
       </div>
     </div>
-  </details>"""
+  </details>""")
         else:
             file_name_html = f'<span class="file-path-folder">{esc(folder_part)}</span><span class="file-path-name">{esc(name_part)}</span> <span class="file-path-lang">({esc(language)})</span>'
-            files_block += f"""
+            file_sections.append(f"""
   <details class="file-collapsible" data-issue-count="0" data-file-path="{esc(file_display)}">
     <summary>
       <span class="file-summary-inner">
@@ -507,8 +555,9 @@ def render_review_multi_results(
     <p>No issues found.</p>
       </div>
     </div>
-  </details>"""
+  </details>""")
     
+    files_block = "".join(file_sections)
     if not files_block:
         files_block = "<p>No files analyzed.</p>"
     else:
@@ -543,8 +592,13 @@ def render_review_multi_results(
     _label = (source_path or "").strip()
     _name = Path(_label.replace("\\", "/")).name or Path(_label).stem or "report"
     _stem = Path(_name).stem or _name
-    _safe = (re.sub(r"[^\w\-]", "_", _stem)[:80].strip("_") or "compatibility_report")
+    _safe = (_UNSAFE_NAME_RE.sub("_", _stem)[:80].strip("_") or "compatibility_report")
     download_filename = f"{_safe}_compatibility_report.md"
+    # An upload without a stored report (report_id None) has nothing to download
+    download_link = "" if source_type == "upload" and not report_id else (
+        f'  <a href="{download_url}" download="{download_filename}" class="download-button">'
+        "⬇ Download Multi-File Report</a>\n"
+    )
 
     return render_template(
         "review_multi_results.html",
@@ -552,8 +606,7 @@ def render_review_multi_results(
         source_path=esc(source_path),
         source_path_escaped=source_path_escaped,
         source_type=esc(source_type),
-        download_url=download_url,
-        download_filename=download_filename,
+        download_link=download_link,
         error_block=error_block,
         total_files=total_files,
         total_issues=total_issues,
@@ -1,7 +1,7 @@
 """Utility functions for the API."""
 
 from .config import ensure_checker_import_path
-from deps import HTTPException, List, Optional, Path, Tuple
+from deps import functools, HTTPException, List, Optional, os, Path, Tuple
 from .schemas import AnalyzeRequest, IssueOut
 from .services import CheckerService
 
@@ -11,24 +11,63 @@ from cross_platform_checker.utils import detect_language
 
 checker_svc = CheckerService()
 
+# Larger files are rejected before the checker reads them
+MAX_FILE_BYTES = 10 * 1024 * 1024
+# Code handed to the AI service is truncated far below this, so larger files are not read in full
+MAX_CODE_BYTES = 1024 * 1024
+_READ_CHUNK = 64 * 1024
 
-def run_check(req: AnalyzeRequest) -> Tuple[List[IssueOut], Optional[str], Optional[str]]:
-    """Run checker. Returns (issues, code, language) for AI. code/lang are set when available."""
+
+def read_capped(p: Path, max_bytes: int = MAX_CODE_BYTES) -> str:
+    """Read at most max_bytes of p and decode as UTF-8 (invalid bytes replaced)."""
+    buf = bytearray()
+    fd = os.open(p, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        while len(buf) < max_bytes:
+            chunk = os.read(fd, min(_READ_CHUNK, max_bytes - len(buf)))
+            if not chunk:
+                break
+            buf += chunk
+    finally:
+        os.close(fd)
+    return buf.decode("utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=128)
+def _analyze_file_version(path: str, mtime_ns: int, size: int) -> List[IssueOut]:
+    """Checker results for one version of a file; unchanged files are not re-analyzed."""
+    return checker_svc.analyze_file(Path(path))
+
+
+def check_path(p: Path, st: Optional[os.stat_result] = None) -> Tuple[List[IssueOut], Optional[str], Optional[str]]:
+    """Run checker on a file path. Returns (issues, code, language) for AI.
+
+    Pass st when the caller has already stat'ed p, to avoid a second stat.
+    """
+    if not p.is_absolute():
+        raise HTTPException(400, "file_path must be absolute")
+    if st is None:
+        try:
+            st = os.stat(p)
+        except OSError:
+            raise HTTPException(404, f"File not found: {p}")
+    if st.st_size > MAX_FILE_BYTES:
+        raise HTTPException(413, f"File too large (limit {MAX_FILE_BYTES // (1024 * 1024)} MB): {p}")
+    issues = list(_analyze_file_version(str(p), st.st_mtime_ns, st.st_size))
     code: Optional[str] = None
     lang: Optional[str] = None
+    try:
+        code = read_capped(p)
+        lang = detect_language(p)
+    except Exception:
+        pass
+    return issues, code, lang
+
+
+def run_check(req: AnalyzeRequest) -> Tuple[List[IssueOut], Optional[str], Optional[str]]:
+    """Run checker. Returns (issues, code, language) for AI. code/lang are set when available."""
     if req.file_path:
-        p = Path(req.file_path)
-        if not p.is_absolute():
-            raise HTTPException(400, "file_path must be absolute")
-        if not p.exists():
-            raise HTTPException(404, f"File not found: {req.file_path}")
-        issues = checker_svc.analyze_file(p)
-        try:
-            code = p.read_text(encoding="utf-8", errors="replace")
-            lang = detect_language(p)
-        except Exception:
-            pass
-        return issues, code, lang
+        return check_path(Path(req.file_path))
     if req.code is not None and req.language:
         issues = checker_svc.analyze_code(
             req.code,
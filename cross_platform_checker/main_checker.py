@@ -51,8 +51,12 @@ class CrossPlatformChecker:
             'swift': SwiftChecker(),
         }
         
-    def check_file(self, file_path: Path) -> List[Issue]:
-        """Check a file for cross-platform issues."""
+    def check_file(self, file_path: Path, texts: Optional[Dict[Path, str]] = None) -> List[Issue]:
+        """Check a file for cross-platform issues.
+
+        If texts is given, the decoded file content is stored in it under file_path so
+        later passes (e.g. import extraction) can reuse it instead of reading the file again.
+        """
         self.file_path = file_path
         self.issues = []
         
@@ -73,6 +77,8 @@ class CrossPlatformChecker:
                 f"Could not read file: {e}",
                 "", "", "FILE_IO"
             )]
+        if texts is not None:
+            texts[file_path] = content
         
         candidates: List[Candidate] = []
 
@@ -94,18 +100,19 @@ class CrossPlatformChecker:
 
         return self.issues
     
-    def check_files(self, file_paths: List[Path]) -> Dict[Path, List[Issue]]:
+    def check_files(self, file_paths: List[Path], texts: Optional[Dict[Path, str]] = None) -> Dict[Path, List[Issue]]:
         """Check multiple files for cross-platform issues.
         
         Args:
             file_paths: List of file paths to analyze
+            texts: Optional dict that receives each readable file's decoded content
             
         Returns:
             Dictionary mapping file path to list of issues found in that file
         """
         results: Dict[Path, List[Issue]] = {}
         for file_path in file_paths:
-            issues = self.check_file(file_path)
+            issues = self.check_file(file_path, texts)
             results[file_path] = issues
         return results
     
@@ -137,6 +144,7 @@ class CrossPlatformChecker:
         # Build dependency graph
         graph: Dict[str, Dict[str, List[str]]] = {}
         missing_imports: List[str] = []
+        index = self._import_index(file_set)
         
         for file_path, imports in imports_by_file.items():
             file_str = str(file_path)
@@ -144,7 +152,7 @@ class CrossPlatformChecker:
             
             for imp in imports:
                 # Try to resolve import to actual file
-                resolved = self._resolve_import(imp, file_path, file_set)
+                resolved = self._resolve_import(imp, file_path, file_set, index)
                 if resolved:
                     resolved_str = str(resolved)
                     graph[file_str]["imports"].append(resolved_str)
@@ -164,16 +172,17 @@ class CrossPlatformChecker:
             "graph": graph,
         }
     
-    def _extract_imports(self, file_path: Path, language: str) -> List[str]:
-        """Extract import statements from a file based on language."""
+    def _extract_imports(self, file_path: Path, language: str, content: Optional[str] = None) -> List[str]:
+        """Extract import statements from a file based on language (content: already-read text, if any)."""
         imports: List[str] = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
-        except Exception:
-            return imports
+        if content is None:
+            try:
+                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+            except Exception:
+                return imports
+        lines = content.split('\n')
         
         if language == 'python':
             imports.extend(self._extract_python_imports(lines))
@@ -380,12 +389,38 @@ class CrossPlatformChecker:
                 imports.append(match.group(1))
         return imports
     
-    def _resolve_import(self, imp: str, from_file: Path, file_set: set) -> Optional[Path]:
-        """Try to resolve an import to an actual file path."""
+    def _import_index(self, file_set: set) -> tuple:
+        """Per-file-set lookup data for _resolve_import: (resolved files, common root, [(module_path, file)]).
+
+        Build it once per batch and pass it to every _resolve_import call instead of
+        re-resolving the whole set (and its common root) for each import.
+        """
         import os
 
+        files = {p.resolve() for p in file_set}
+        try:
+            common = Path(os.path.commonpath([str(p) for p in files]))
+            if common.is_file():
+                common = common.parent
+        except (ValueError, TypeError):
+            common = None
+        modules = []
+        if common:
+            for fp in files:
+                try:
+                    rel = fp.relative_to(common)
+                except ValueError:
+                    continue
+                stem = str(rel).replace('\\', '/').replace('.py', '').replace('.ts', '').replace('.js', '').replace('.java', '').replace('.kt', '').replace('.go', '').replace('.lua', '').replace('.swift', '')
+                if stem.endswith('/__init__'):
+                    stem = stem[:-9]
+                modules.append((stem.replace('/', '.'), fp))
+        return files, common, modules
+
+    def _resolve_import(self, imp: str, from_file: Path, file_set: set, index: Optional[tuple] = None) -> Optional[Path]:
+        """Try to resolve an import to an actual file path."""
         from_file = from_file.resolve()
-        file_set = {p.resolve() for p in file_set}
+        file_set, common, modules = index if index is not None else self._import_index(file_set)
 
         imp_clean = imp.strip()
         if not imp_clean:
@@ -416,25 +451,9 @@ class CrossPlatformChecker:
 
         # Dotted module path (e.g. app.utils): match by module path derived from file_set
         if '.' in imp_clean and not imp_clean.startswith(('node_modules', '/')):
-            try:
-                common = Path(os.path.commonpath([str(p) for p in file_set]))
-                if common.is_file():
-                    common = common.parent
-            except (ValueError, TypeError):
-                common = None
-            if common:
-                imp_module = imp_base.replace('.', '/')
-                for fp in file_set:
-                    try:
-                        rel = fp.relative_to(common)
-                    except ValueError:
-                        continue
-                    stem = str(rel).replace('\\', '/').replace('.py', '').replace('.ts', '').replace('.js', '').replace('.java', '').replace('.kt', '').replace('.go', '').replace('.lua', '').replace('.swift', '')
-                    if stem.endswith('/__init__'):
-                        stem = stem[:-9]
-                    module_path = stem.replace('/', '.')
-                    if module_path == imp_base or module_path.endswith('.' + imp_base):
-                        return fp
+            for module_path, fp in modules:
+                if module_path == imp_base or module_path.endswith('.' + imp_base):
+                    return fp
 
         # Exact filename match
         for fp in file_set:
@@ -25,28 +25,12 @@ class ReportGenerator:
         warnings = [i for i in issues if i.severity == Severity.WARNING]
         infos = [i for i in issues if i.severity == Severity.INFO]
         
-        if errors:
-            report.append(f"ERRORS ({len(errors)}):")
+        for title, group in (("ERRORS", errors), ("WARNINGS", warnings), ("INFO", infos)):
+            if not group:
+                continue
+            report.append(f"{title} ({len(group)}):")
             report.append("-" * 80)
-            for issue in errors:
-                report.append(f"  Line {issue.line_number}: {issue.message}")
-                report.append(f"    Code: {issue.code}")
-                report.append(f"    Fix: {issue.suggestion}")
-                report.append(f"    Category: {issue.category}\n")
-        
-        if warnings:
-            report.append(f"WARNINGS ({len(warnings)}):")
-            report.append("-" * 80)
-            for issue in warnings:
-                report.append(f"  Line {issue.line_number}: {issue.message}")
-                report.append(f"    Code: {issue.code}")
-                report.append(f"    Fix: {issue.suggestion}")
-                report.append(f"    Category: {issue.category}\n")
-        
-        if infos:
-            report.append(f"INFO ({len(infos)}):")
-            report.append("-" * 80)
-            for issue in infos:
+            for issue in group:
                 report.append(f"  Line {issue.line_number}: {issue.message}")
                 report.append(f"    Code: {issue.code}")
                 report.append(f"    Fix: {issue.suggestion}")
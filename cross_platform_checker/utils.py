@@ -167,29 +167,31 @@ def has_variable_path_argument(line: str, language: str = "python") -> bool:
     return False
 
 
+# Language detection is a pure function of the file extension
+_EXT_TO_LANG = {
+    '.py': 'python',
+    '.cpp': 'cpp',
+    '.cxx': 'cpp',
+    '.cc': 'cpp',
+    '.c': 'c',
+    '.h': 'c',
+    '.hpp': 'cpp',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.ts': 'typescript',
+    '.java': 'java',
+    '.kt': 'kotlin',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.cs': 'csharp',
+    '.lua': 'lua',
+    '.swift': 'swift',
+}
+
+
 def detect_language(file_path: Path) -> str:
     """Detect programming language from file extension."""
-    ext = file_path.suffix.lower()
-    lang_map = {
-        '.py': 'python',
-        '.cpp': 'cpp',
-        '.cxx': 'cpp',
-        '.cc': 'cpp',
-        '.c': 'c',
-        '.h': 'c',
-        '.hpp': 'cpp',
-        '.js': 'javascript',
-        '.jsx': 'javascript',
-        '.ts': 'typescript',
-        '.java': 'java',
-        '.kt': 'kotlin',
-        '.go': 'go',
-        '.rs': 'rust',
-        '.cs': 'csharp',
-        '.lua': 'lua',
-        '.swift': 'swift',
-    }
-    return lang_map.get(ext, 'unknown')
+    return _EXT_TO_LANG.get(file_path.suffix.lower(), 'unknown')
 
 
 def position_inside_string_literal(line: str, pos: int) -> bool:
@@ -1,22 +1,34 @@
 """Centralized imports for the entire project (app + cross_platform_checker)."""
 
 # Standard library
+import functools
+import hashlib
 import html
+import io
+import itertools
 import json
+import multiprocessing
 import os
 import re
+import secrets
+import shutil
+import stat
 import tempfile
+import threading
 import time
-import uuid
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager, nullcontext
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, BinaryIO, Dict, Hashable, Iterator, List, Optional, Set, Tuple, Union
 from urllib.parse import quote
 
 # External
+import anyio.to_thread
 from fastapi import (
     APIRouter,
     File,
@@ -26,9 +38,8 @@ from fastapi import (
     UploadFile,
 )
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, Response
-from pydantic import BaseModel, Field
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 try:
     from dotenv import load_dotenv
@@ -0,0 +1,36 @@
+"""OpenCORSMiddleware response headers."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_simple_request_echoes_origin():
+    r = client.get("/", headers={"Origin": "https://example.com"})
+    assert r.headers["access-control-allow-origin"] == "https://example.com"
+    assert r.headers["access-control-allow-credentials"] == "true"
+    assert "Origin" in r.headers["vary"]
+
+
+def test_preflight_echoes_origin():
+    r = client.options(
+        "/review/multi",
+        headers={
+            "Origin": "https://example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type",
+        },
+    )
+    assert r.status_code == 204
+    assert r.headers["access-control-allow-origin"] == "https://example.com"
+    assert r.headers["access-control-allow-credentials"] == "true"
+    assert r.headers["access-control-allow-headers"] == "content-type"
+    assert "Origin" in r.headers["vary"]
+
+
+def test_no_cors_headers_without_origin():
+    r = client.get("/")
+    assert "access-control-allow-origin" not in r.headers
+    assert "access-control-allow-credentials" not in r.headers
@@ -0,0 +1,16 @@
+"""Multi-file review when the source changes mid-request."""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import review
+
+
+def test_file_deleted_after_folder_walk(tmp_path, monkeypatch):
+    (tmp_path / "a.py").write_text("import os\nos.system('dir')\n")
+    gone = tmp_path / "gone.py"
+    # The walk still lists gone.py, but it no longer exists when the cache key is built
+    monkeypatch.setattr(review, "extract_files", lambda p: [tmp_path / "a.py", gone])
+    r = TestClient(app).post("/review/multi", json={"folder_path": str(tmp_path)})
+    assert r.status_code == 200
+    assert any(f["file_path"].endswith("a.py") for f in r.json()["files"])
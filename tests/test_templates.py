@@ -0,0 +1,10 @@
+"""Template helpers."""
+
+import html
+
+from app.templates import _esc
+
+
+def test_esc_matches_html_escape():
+    s = "a & b < c > d \"e\" 'f' &amp;"
+    assert _esc(s) == html.escape(s, quote=True)
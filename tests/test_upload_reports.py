@@ -0,0 +1,67 @@
+"""Upload report storage under the shared temp dir."""
+
+import os
+
+import pytest
+
+from app.routes import review
+
+
+@pytest.fixture
+def reports_dir(tmp_path, monkeypatch):
+    path = tmp_path / "compat_reports"
+    monkeypatch.setattr(review, "_REPORTS_DIR", path)
+    return path
+
+
+def test_save_and_open_round_trip(reports_dir):
+    review._save_upload_report("abc", iter(["# Report\n", "body\n"]), "proj")
+    assert (reports_dir.stat().st_mode & 0o777) == 0o700
+    f, label = review._open_upload_report("abc")
+    assert label == "proj"
+    assert b"".join(review._iter_report_file(f)) == b"# Report\nbody\n"
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_refuses_shared_dir(reports_dir):
+    reports_dir.mkdir(mode=0o777)
+    os.chmod(reports_dir, 0o777)
+    with pytest.raises(OSError):
+        review._save_upload_report("abc", iter(["x"]), "proj")
+    assert review._open_upload_report("abc") is None
+
+
+def test_refuses_symlinked_dir(reports_dir, tmp_path):
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    reports_dir.symlink_to(target)
+    with pytest.raises(OSError):
+        review._save_upload_report("abc", iter(["x"]), "proj")
+    assert not list(target.iterdir())
+
+
+def test_refuses_planted_temp_file(reports_dir, tmp_path):
+    reports_dir.mkdir(mode=0o700)
+    victim = tmp_path / "victim"
+    victim.write_text("keep")
+    (reports_dir / ".abc.tmp").symlink_to(victim)
+    with pytest.raises(OSError):
+        review._save_upload_report("abc", iter(["x"]), "proj")
+    assert victim.read_text() == "keep"
+
+
+def test_upload_renders_without_download_when_reports_dir_unusable(reports_dir):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    reports_dir.write_text("not a directory")
+    files = [
+        ("files", ("proj/a.py", b"import os\nos.system('dir')\n", "text/plain")),
+        ("files", ("proj/b.py", b"import a\n", "text/plain")),
+    ]
+    r = TestClient(app).post("/review/results", files=files, data={"mode": "rules"})
+    assert r.status_code == 200
+    assert "Error analyzing uploaded selection" not in r.text
+    assert "a.py" in r.text
+    assert "report_id=" not in r.text